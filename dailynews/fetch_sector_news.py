@@ -11,14 +11,18 @@ Strategy:
 Output: dailynews/sector_news.json
 Runtime: ~1-2 minutes (60 API calls/minute limit)
 """
-import yaml
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from operator import itemgetter
 
 from finnhub_client import FinnhubClient, get_date_range
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.config_io import load_yaml_config
+
 
 # GICS Sector mapping with top 5 stocks per sector
 SECTOR_TICKERS = {
@@ -71,7 +75,7 @@ def fetch_sector_news(config: dict, max_per_sector: int = 9, max_per_ticker: int
     if not api_key:
         raise ValueError("FINNHUB_API_KEY environment variable not set")
     
-    client = FinnhubClient(api_key=api_key)
+    client = FinnhubClient(api_key=api_key, cache_dir=config['api'].get('cache_dir'))
     
     # Get date range
     lookback_days = config['news']['lookback_days']
@@ -90,6 +94,7 @@ def fetch_sector_news(config: dict, max_per_sector: int = 9, max_per_ticker: int
     
     # Fetch news for all tickers
     ticker_news = client.get_company_news_batch(all_tickers, from_date, to_date)
+    client.print_cache_summary()
     
     # Define source priority (1 = highest)
     source_priority = {
@@ -98,13 +103,10 @@ def fetch_sector_news(config: dict, max_per_sector: int = 9, max_per_ticker: int
         'MarketWatch': 3
     }
     
-    # Sort function for articles: source priority first, then most recent
-    def sort_key(article):
-        source = article.get('source', 'Unknown')
-        priority = source_priority.get(source, 999)
-        timestamp = article.get('datetime', 0)
-        # Negative timestamp for descending order (newest first)
-        return (priority, -timestamp)
+    # Sort key for articles: source priority first, then most recent. The rank fields
+    # are attached once at ingestion so sorting reads them via a C-level itemgetter
+    # instead of a Python callback doing dict lookups per article.
+    sort_key = itemgetter('_prio', '_negdt')
     
     # Group articles by sector with ticker limits
     sector_articles = defaultdict(list)
@@ -115,12 +117,18 @@ def fetch_sector_news(config: dict, max_per_sector: int = 9, max_per_ticker: int
         for ticker in tickers:
             articles = ticker_news.get(ticker, [])
             
-            # Filter to only priority sources and add ticker
-            priority_articles = [
-                {**article, 'ticker': ticker}
-                for article in articles 
-                if article.get('source') in source_priority
-            ]
+            # Filter to only priority sources and tag with ticker and rank fields
+            # (Finnhub returns fresh dicts per call, so tagging in place is safe;
+            # format_output copies only the public fields)
+            priority_articles = []
+            for article in articles:
+                source = article.get('source')
+                if source in source_priority:
+                    article['ticker'] = ticker
+                    article['_prio'] = source_priority[source]
+                    # Negative timestamp for descending order (newest first)
+                    article['_negdt'] = -article.get('datetime', 0)
+                    priority_articles.append(article)
             
             # Sort and limit per ticker
             priority_articles.sort(key=sort_key)
@@ -197,7 +205,8 @@ def format_output(sector_news: dict, config: dict) -> dict:
         "sectors": {}
     }
     
-    # Format articles for each sector
+    # Format articles for each sector (fromtimestamp bound locally for the per-article loop)
+    fromtimestamp = datetime.fromtimestamp
     for sector, articles in sector_news.items():
         etf_ticker = SECTOR_TO_ETF.get(sector, sector)
         output["sectors"][etf_ticker] = {
@@ -213,7 +222,7 @@ def format_output(sector_news: dict, config: dict) -> dict:
                 "ticker": article.get('ticker'),
                 "url": article.get('url'),
                 "category": article.get('category'),
-                "datetime": datetime.fromtimestamp(article.get('datetime', 0)).isoformat(),
+                "datetime": fromtimestamp(article.get('datetime', 0)).isoformat(),
                 "timestamp": article.get('datetime'),
                 "id": article.get('id')
             }
@@ -225,10 +234,7 @@ def format_output(sector_news: dict, config: dict) -> dict:
 def main():
     """Main entry point."""
     # Load config
-    config_path = Path(__file__).parent / 'config.yml'
-    
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config(Path(__file__).parent / 'config.yml')
     
     print("="*70)
     print("FETCH SECTOR NEWS (Production)")
@@ -10,21 +10,68 @@ Strategy:
 Output: dailynews/top_news.json
 Runtime: ~1-2 seconds (single API call)
 """
-import yaml
-import json
+import heapq
 import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, FrozenSet, Tuple
 
 from finnhub_client import FinnhubClient, get_date_range
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.config_io import load_yaml_config
+from shared.json_io import write_json
 
-def fetch_and_rank_news(config: dict) -> list:
+
+@dataclass(frozen=True, slots=True)
+class NewsConfig:
+    """News ranking settings derived once from the `news` section of config.yml."""
+    
+    source_priority: Dict[str, int]      # source -> priority (1 = highest), exclusions removed
+    priority_names: Tuple[str, ...]      # sources in config order, exclusions removed
+    excluded_names: Tuple[str, ...]      # excluded sources in config order
+    excluded: FrozenSet[str]
+    max_articles: int
+    
+    @classmethod
+    def from_config(cls, config: dict) -> "NewsConfig":
+        """
+        Build from the parsed YAML configuration.
+        
+        Excluded sources are removed from the priority map up front, so ranking
+        needs a single membership test per article.
+        """
+        news = config['news']
+        source_priority_list = news.get('source_priority', [])
+        excluded_names = tuple(news.get('excluded_sources', []) or [])
+        excluded = frozenset(excluded_names)
+        
+        conflicts = [item['source'] for item in source_priority_list if item['source'] in excluded]
+        if conflicts:
+            print(f"⚠ Sources both prioritized and excluded (excluding): {', '.join(conflicts)}",
+                  file=sys.stderr)
+        
+        effective = [item for item in source_priority_list if item['source'] not in excluded]
+        return cls(
+            source_priority={item['source']: item['priority'] for item in effective},
+            priority_names=tuple(item['source'] for item in effective),
+            excluded_names=excluded_names,
+            excluded=excluded,
+            max_articles=news.get('max_articles', 100),
+        )
+
+
+def fetch_and_rank_news(config: dict, news_cfg: NewsConfig) -> list:
     """
     Fetch market news and rank by source priority from config.
     
     Args:
-        config: Configuration dictionary with news.source_priority settings
+        config: Configuration dictionary (API settings)
+        news_cfg: News ranking settings
         
     Returns:
         List of ranked news articles
@@ -39,64 +86,41 @@ def fetch_and_rank_news(config: dict) -> list:
                            "Set it in your shell or GitHub repository secrets.")
     
     # Initialize client
-    client = FinnhubClient(api_key=api_key)
+    client = FinnhubClient(api_key=api_key, cache_dir=config['api'].get('cache_dir'))
     
     # Get config settings
-    max_articles = config['news'].get('max_articles', 100)
-    source_priority_list = config['news'].get('source_priority', [])
-    excluded_sources = config['news'].get('excluded_sources', [])
-    
-    # Build source priority dictionary from config
-    source_priority = {}
-    priority_source_names = []
-    for item in source_priority_list:
-        source = item['source']
-        priority = item['priority']
-        source_priority[source] = priority
-        priority_source_names.append(source)
+    max_articles = news_cfg.max_articles
+    source_priority = news_cfg.source_priority
+    priority_source_names = news_cfg.priority_names
     
     print(f"Source priority: {' → '.join(priority_source_names)}")
-    if excluded_sources:
-        print(f"Excluded sources: {', '.join(excluded_sources)}")
+    if news_cfg.excluded:
+        print(f"Excluded sources: {', '.join(news_cfg.excluded_names)}")
     
     # Fetch market news
     print(f"\nFetching market news...")
     all_news = client.get_market_news(category='general')
     print(f"✓ Retrieved {len(all_news)} articles")
-    
-    # Filter out excluded sources
-    if excluded_sources:
-        all_news = [
-            article for article in all_news 
-            if article.get('source') not in excluded_sources
-        ]
-        print(f"✓ After exclusions: {len(all_news)} articles")
-    
-    # Filter to only include priority sources
-    priority_news = [
-        article for article in all_news 
-        if article.get('source') in source_priority
-    ]
-    
-    print(f"✓ Filtered to {len(priority_news)} articles from priority sources")
-    
-    # Sort by priority, then by datetime (newest first)
-    def sort_key(article):
-        source = article.get('source', 'Unknown')
-        priority = source_priority.get(source, 999)
-        timestamp = article.get('datetime', 0)
-        return (priority, -timestamp)  # Negative timestamp for descending order
-    
-    priority_news.sort(key=sort_key)
-    
-    # Take top N articles
-    ranked_news = priority_news[:max_articles]
+    client.print_cache_summary()
+    
+    # Single fused pass: keep priority sources (exclusions are already removed from
+    # source_priority), decorating each with its (priority, -timestamp) rank once so
+    # the heap compares plain tuples in C (index breaks ties stably and keeps dicts
+    # out of comparisons)
+    # (Finnhub always returns 'source' and 'datetime', so C-level itemgetters replace .get calls)
+    get_source = itemgetter('source')
+    get_dt = itemgetter('datetime')
+    decorated = (
+        (source_priority[source], -get_dt(article), idx, article)
+        for idx, article in enumerate(all_news)
+        if (source := get_source(article)) in source_priority
+    )
+    
+    # Top N via a size-k heap: O(n log k) instead of sorting everything
+    ranked_news = [item[3] for item in heapq.nsmallest(max_articles, decorated)]
     
     # Count by source
-    source_counts = {}
-    for article in ranked_news:
-        source = article.get('source', 'Unknown')
-        source_counts[source] = source_counts.get(source, 0) + 1
+    source_counts = Counter(article.get('source', 'Unknown') for article in ranked_news)
     
     print(f"\n✓ Selected {len(ranked_news)} articles (max: {max_articles}):")
     for source in priority_source_names:
@@ -105,7 +129,8 @@ def fetch_and_rank_news(config: dict) -> list:
             print(f"  {source:15s}: {count:3d} articles")
     
     # Show any other sources that made it through
-    other_sources = set(source_counts.keys()) - set(priority_source_names)
+    # (dict key views support set difference directly; no intermediate sets)
+    other_sources = source_counts.keys() - source_priority.keys()
     if other_sources:
         print(f"\n  Other sources:")
         for source in sorted(other_sources):
@@ -114,22 +139,15 @@ def fetch_and_rank_news(config: dict) -> list:
     return ranked_news
 
 
-def format_output(news: list, config: dict) -> dict:
+def format_output(news: list, news_cfg: NewsConfig) -> dict:
     """Format news data for JSON output."""
-    # Get source priority list for metadata
-    source_priority_list = config['news'].get('source_priority', [])
-    excluded_sources = config['news'].get('excluded_sources', [])
-    max_articles = config['news'].get('max_articles', 100)
-    
-    priority_sources = [item['source'] for item in source_priority_list]
-    
     output = {
         "metadata": {
             "generated_at": datetime.now().isoformat(),
             "type": "top_market_news",
-            "source_priority": priority_sources,
-            "excluded_sources": excluded_sources,
-            "max_articles": max_articles,
+            "source_priority": list(news_cfg.priority_names),
+            "excluded_sources": list(news_cfg.excluded_names),
+            "max_articles": news_cfg.max_articles,
             "actual_articles": len(news),
             "stats": {
                 "total_articles": len(news)
@@ -138,7 +156,9 @@ def format_output(news: list, config: dict) -> dict:
         "articles": []
     }
     
-    # Format articles
+    # Format articles (fromtimestamp bound locally to skip the attribute lookup per article;
+    # stays on stdlib so timestamps keep local-time semantics)
+    fromtimestamp = datetime.fromtimestamp
     for article in news:
         formatted = {
             "headline": article.get('headline'),
@@ -146,7 +166,7 @@ def format_output(news: list, config: dict) -> dict:
             "source": article.get('source'),
             "url": article.get('url'),
             "category": article.get('category'),
-            "datetime": datetime.fromtimestamp(article.get('datetime', 0)).isoformat(),
+            "datetime": fromtimestamp(article.get('datetime', 0)).isoformat(),
             "timestamp": article.get('datetime'),
             "id": article.get('id')
         }
@@ -158,33 +178,27 @@ def format_output(news: list, config: dict) -> dict:
 def main():
     """Main entry point."""
     # Load config
-    config_path = Path(__file__).parent / 'config.yml'
-    
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config(Path(__file__).parent / 'config.yml')
     
-    # Get settings from config
-    source_priority_list = config['news'].get('source_priority', [])
-    max_articles = config['news'].get('max_articles', 100)
-    priority_sources = [item['source'] for item in source_priority_list]
+    # Derive news settings once and pass them through
+    news_cfg = NewsConfig.from_config(config)
     
     print("="*70)
     print("FETCH TOP MARKET NEWS (Production)")
-    print(f"Priority: {' → '.join(priority_sources)}")
-    print(f"Max Articles: {max_articles}")
+    print(f"Priority: {' → '.join(news_cfg.priority_names)}")
+    print(f"Max Articles: {news_cfg.max_articles}")
     print("="*70)
     print()
     
     # Fetch and rank news
-    ranked_news = fetch_and_rank_news(config)
+    ranked_news = fetch_and_rank_news(config, news_cfg)
     
     # Format output
-    output_data = format_output(ranked_news, config)
+    output_data = format_output(ranked_news, news_cfg)
     
     # Save to dailynews directory
     output_file = Path(__file__).parent / 'top_news.json'
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    write_json(output_data, output_file, indent=2)
     
     print(f"\n✓ Saved to: {output_file}")
     print("\n" + "="*70)
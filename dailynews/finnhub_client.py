@@ -5,56 +5,169 @@ This module provides functions to interact with Finnhub's news endpoints:
 - Market News: Get latest general market news
 - Company News: Get news for specific tickers with date ranges
 """
+import hashlib
+import json
+import os
 import requests
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
 import sys
 
+# Try to import httpx for HTTP/2 multiplexing (falls back to requests)
+try:
+    import httpx
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+if HAS_HTTP2:
+    TRANSPORT_ERRORS = (requests.exceptions.RequestException, httpx.TransportError)
+else:
+    TRANSPORT_ERRORS = (requests.exceptions.RequestException,)
+
+# Retry policy for throttled (429) and transient server errors:
+# exponential backoff of 1s, 2s, 4s, 8s, 16s unless the server sends Retry-After
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 1.0
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Response cache TTLs (seconds a cached payload stays fresh, per endpoint); the
+# cache itself is opt-in through cache_dir (api.cache_dir in config.yml)
+DEFAULT_CACHE_TTLS = {
+    '/news': 300,
+    '/company-news': 1800,
+    '/calendar/earnings': 3600,
+}
+
 
 class FinnhubClient:
     """Client for interacting with Finnhub API."""
     
-    def __init__(self, api_key: str, base_url: str = "https://finnhub.io/api/v1"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://finnhub.io/api/v1",
+        cache_dir: Optional[Path] = None,
+        cache_ttls: Optional[Dict[str, int]] = None
+    ):
         """
         Initialize Finnhub client.
         
         Args:
             api_key: Finnhub API key
             base_url: Base URL for Finnhub API (default: https://finnhub.io/api/v1)
+            cache_dir: Directory for the response cache (default None: no caching)
+            cache_ttls: Per-endpoint cache TTL in seconds (default: DEFAULT_CACHE_TTLS)
         """
         self.api_key = api_key
         self.base_url = base_url
-        self.session = requests.Session()
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.cache_ttls = DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls
+        self.cache_hits = 0
+        self.cache_misses = 0
+        if HAS_HTTP2:
+            # One HTTP/2 connection multiplexes all requests (no per-connection head-of-line blocking)
+            self.session = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+                timeout=20,
+            )
+        else:
+            self.session = requests.Session()
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=sorted(RETRY_STATUSES),
+                respect_retry_after_header=True,
+                allowed_methods=frozenset(['GET']),
+            )
+            self.session.mount('https://', HTTPAdapter(max_retries=retry))
         self.last_request_time = 0
         self.request_count = 0
         self.minute_start = time.time()
         self.max_calls_per_minute = 60  # Finnhub limit: 60 calls/minute
+        self._rate_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
         
     def _rate_limit(self):
-        """Implement rate limiting to stay under 60 API calls/minute."""
-        current_time = time.time()
-        
-        # Reset counter every minute
-        if current_time - self.minute_start >= 60:
-            self.request_count = 0
-            self.minute_start = current_time
-        
-        # If we've hit the limit, wait until the minute is up
-        if self.request_count >= self.max_calls_per_minute:
-            sleep_time = 60 - (current_time - self.minute_start)
-            if sleep_time > 0:
-                print(f"Rate limit: {self.request_count} calls in last minute. Waiting {sleep_time:.1f}s...", file=sys.stderr)
-                time.sleep(sleep_time)
+        """Implement rate limiting to stay under 60 API calls/minute (thread-safe)."""
+        with self._rate_lock:
+            current_time = time.time()
+            
+            # Reset counter every minute
+            if current_time - self.minute_start >= 60:
                 self.request_count = 0
-                self.minute_start = time.time()
+                self.minute_start = current_time
+            
+            # If we've hit the limit, wait until the minute is up (other workers queue on the lock)
+            if self.request_count >= self.max_calls_per_minute:
+                sleep_time = 60 - (current_time - self.minute_start)
+                if sleep_time > 0:
+                    print(f"Rate limit: {self.request_count} calls in last minute. Waiting {sleep_time:.1f}s...", file=sys.stderr)
+                    time.sleep(sleep_time)
+                    self.request_count = 0
+                    self.minute_start = time.time()
+            
+            self.request_count += 1
+            self.last_request_time = time.time()
+    
+    def _cache_path(self, endpoint: str, params: Dict) -> Optional[Path]:
+        """Get the cache file for a request, or None if the endpoint is not cached."""
+        if self.cache_dir is None or endpoint not in self.cache_ttls:
+            return None
+        key = json.dumps([endpoint, sorted(params.items())], default=str)
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+    
+    def _cache_get(self, endpoint: str, params: Dict):
+        """Return a fresh cached payload, or None on miss/expiry."""
+        path = self._cache_path(endpoint, params)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
         
-        self.request_count += 1
-        self.last_request_time = time.time()
+        hit = entry is not None and time.time() - entry['timestamp'] < self.cache_ttls[endpoint]
+        with self._stats_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        return entry['payload'] if hit else None
+    
+    def print_cache_summary(self) -> None:
+        """Print the response cache's hit/miss counts in one line (nothing if caching is off)."""
+        if self.cache_dir is None:
+            return
+        print(f"Response cache: {self.cache_hits} hits, {self.cache_misses} misses ({self.cache_dir})",
+              file=sys.stderr)
+    
+    def _cache_put(self, endpoint: str, params: Dict, payload) -> None:
+        """Store a payload in the cache (atomic replace, failures are non-fatal)."""
+        path = self._cache_path(endpoint, params)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'timestamp': time.time(), 'payload': payload}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Cache write failed for {endpoint}: {e}", file=sys.stderr)
     
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """
-        Make API request with rate limiting and error handling.
+        Make API request with caching, rate limiting and error handling.
         
         Args:
             endpoint: API endpoint (e.g., '/news')
@@ -63,30 +176,48 @@ class FinnhubClient:
         Returns:
             JSON response as dict
         """
-        self._rate_limit()
-        
         if params is None:
             params = {}
         
-        params['token'] = self.api_key
+        cached = self._cache_get(endpoint, params)
+        if cached is not None:
+            return cached
+        
+        self._rate_limit()
+        
         url = f"{self.base_url}{endpoint}"
+        request_params = {**params, 'token': self.api_key}
         
-        try:
-            response = self.session.get(url, params=params, timeout=20)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 429:
-                print(f"Rate limit exceeded. Waiting 1 second...", file=sys.stderr)
-                time.sleep(1)
-                return self._make_request(endpoint, params)  # Retry
-            else:
-                print(f"HTTP Error: {e}", file=sys.stderr)
-                print(f"Response: {response.text}", file=sys.stderr)
+        # requests.Session retries inside its urllib3 adapter; httpx has no status-based
+        # retry, so the same bounded backoff policy is applied here for that client.
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = self.session.get(url, params=request_params, timeout=20)
+            except TRANSPORT_ERRORS as e:
+                print(f"Request Error: {e}", file=sys.stderr)
                 raise
-        except requests.exceptions.RequestException as e:
-            print(f"Request Error: {e}", file=sys.stderr)
-            raise
+            
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            
+            delay = _retry_after_seconds(response)
+            if delay is None:
+                delay = BACKOFF_FACTOR * (2 ** attempt)
+            print(f"HTTP {response.status_code} from {endpoint}. Retrying in {delay:.1f}s "
+                  f"({attempt + 1}/{MAX_RETRIES})...", file=sys.stderr)
+            time.sleep(delay)
+        
+        if response.status_code >= 400:
+            print(f"HTTP Error: {response.status_code} for {endpoint}", file=sys.stderr)
+            print(f"Response: {response.text}", file=sys.stderr)
+            raise requests.HTTPError(
+                f"Finnhub API error {response.status_code} for {endpoint}",
+                response=response,
+            )
+        
+        payload = response.json()
+        self._cache_put(endpoint, params, payload)
+        return payload
     
     def get_market_news(self, category: str = "general", min_id: int = 0) -> List[Dict]:
         """
@@ -172,6 +303,9 @@ class FinnhubClient:
         """
         Get company news for multiple tickers.
         
+        Requests run on a small thread pool so network latency overlaps with
+        the shared rate limit; results keep the order of `symbols`.
+        
         Args:
             symbols: List of ticker symbols
             from_date: Start date in YYYY-MM-DD format
@@ -184,11 +318,17 @@ class FinnhubClient:
         if verbose:
             print(f"\nFetching company news for {len(symbols)} tickers...", file=sys.stderr)
         
-        results = {}
-        for symbol in symbols:
-            news = self.get_company_news(symbol, from_date, to_date)
-            if news:  # Only include tickers with news
-                results[symbol] = news
+        max_workers = min(8, self.max_calls_per_minute)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched = executor.map(
+                lambda symbol: self.get_company_news(symbol, from_date, to_date),
+                symbols
+            )
+            results = {
+                symbol: news
+                for symbol, news in zip(symbols, fetched)
+                if news  # Only include tickers with news
+            }
         
         if verbose:
             total_articles = sum(len(articles) for articles in results.values())
@@ -197,6 +337,17 @@ class FinnhubClient:
         return results
 
 
+def _retry_after_seconds(response) -> Optional[float]:
+    """Parse a numeric Retry-After header (seconds), or None if absent/unparseable."""
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
 def normalize_ticker(ticker: str) -> str:
     """
     Normalize ticker format for Finnhub API.
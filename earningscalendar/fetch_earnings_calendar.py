@@ -8,18 +8,22 @@ data for all S&P 500 companies using the Finnhub Earnings Calendar API.
 Output: earnings_calendar.json with comprehensive earnings calendar data
 """
 
-import json
 import time
-import yaml
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.spx_universe import get_spx_tickers
+from shared.config_io import load_yaml_config
+from shared.json_io import dumps_json, loads_json, write_json
 
 
 class EarningsCalendarFetcher:
@@ -38,11 +42,31 @@ class EarningsCalendarFetcher:
             raise ValueError("FINNHUB_API_KEY environment variable not set")
         self.base_url = self.config['api']['base_url']
         self.calls_per_minute = self.config['rate_limiting']['calls_per_minute']
-        self.delay_between_calls = self.config['rate_limiting']['delay_between_calls']
         self.window_size = self.config['rate_limiting']['sliding_window_size']
+        self.max_workers = self.config['rate_limiting'].get('max_workers', 8)
         
-        # Sliding window for rate limiting
+        # Per-ticker checkpoint (JSONL) so an interrupted fallback run can resume
+        output_file = Path(self.config['output']['earnings_calendar_file'])
+        self.partial_path = output_file.with_suffix('.partial.jsonl')
+        
+        # Sliding window for rate limiting, shared by all worker threads
         self.call_times = deque(maxlen=self.calls_per_minute)
+        self._rate_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        
+        # Pooled session reused across worker threads (one TCP/TLS handshake per connection),
+        # retrying throttled and transient server errors with backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self.session.mount('https://', adapter)
         
         # Statistics
         self.stats = {
@@ -55,9 +79,8 @@ class EarningsCalendarFetcher:
         }
     
     def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from YAML file."""
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        """Load configuration from YAML file (parsed once per process)."""
+        return load_yaml_config(config_path)
     
     def _get_date_range(self) -> tuple[str, str]:
         """Calculate date range based on configuration."""
@@ -75,25 +98,30 @@ class EarningsCalendarFetcher:
         return from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')
     
     def _rate_limit(self):
-        """Implement sliding window rate limiting."""
-        current_time = time.time()
-        
-        # Remove calls outside the sliding window
-        while self.call_times and (current_time - self.call_times[0]) > self.window_size:
-            self.call_times.popleft()
-        
-        # If we've hit the limit, wait
-        if len(self.call_times) >= self.calls_per_minute:
-            sleep_time = self.window_size - (current_time - self.call_times[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            self.call_times.popleft()
-        
-        # Add delay between calls
-        time.sleep(self.delay_between_calls)
-        
-        # Record this call
-        self.call_times.append(time.time())
+        """Implement sliding window rate limiting (thread-safe)."""
+        with self._rate_lock:
+            current_time = time.time()
+            
+            # Remove calls outside the sliding window
+            while self.call_times and (current_time - self.call_times[0]) > self.window_size:
+                self.call_times.popleft()
+            
+            # If we've hit the limit, wait (holding the lock so other workers queue behind us)
+            if len(self.call_times) >= self.calls_per_minute:
+                sleep_time = self.window_size - (current_time - self.call_times[0])
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                self.call_times.popleft()
+            
+            # Record this call
+            self.call_times.append(time.time())
+    
+    def _record(self, *keys: str, events: int = 0):
+        """Increment statistics counters (thread-safe)."""
+        with self._stats_lock:
+            for key in keys:
+                self.stats[key] += 1
+            self.stats['total_earnings_events'] += events
     
     def fetch_earnings_calendar(self, symbol: str, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
@@ -118,30 +146,143 @@ class EarningsCalendarFetcher:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            self.stats['api_calls'] += 1
+            response = self.session.get(url, params=params, timeout=10)
+            self._record('api_calls')
             
             if response.status_code == 200:
                 data = response.json()
                 earnings_calendar = data.get('earningsCalendar', [])
                 
                 if earnings_calendar:
-                    self.stats['successful'] += 1
-                    self.stats['total_earnings_events'] += len(earnings_calendar)
+                    self._record('successful', events=len(earnings_calendar))
                     return earnings_calendar
                 else:
-                    self.stats['no_data'] += 1
+                    self._record('no_data')
                     return []
             else:
                 print(f"  ✗ {symbol}: HTTP {response.status_code}")
-                self.stats['failed'] += 1
+                self._record('failed')
                 return None
                 
         except Exception as e:
             print(f"  ✗ {symbol}: API error - {e}")
-            self.stats['failed'] += 1
+            self._record('failed')
+            return None
+    
+    def fetch_bulk_earnings_calendar(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
+        """
+        Fetch the whole market's earnings calendar for a date range in one call.
+        
+        Finnhub's /calendar/earnings endpoint returns every company's events
+        when no symbol is given, so this replaces ~500 per-ticker requests.
+        
+        Args:
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            List of earnings events (all symbols) or None if error
+        """
+        url = f"{self.base_url}/calendar/earnings"
+        params = {
+            'from': from_date,
+            'to': to_date,
+            'token': self.api_key
+        }
+        
+        try:
+            response = self.session.get(url, params=params, timeout=30)
+            self._record('api_calls')
+            
+            if response.status_code == 200:
+                return response.json().get('earningsCalendar', [])
+            
+            print(f"  ✗ Bulk earnings calendar: HTTP {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"  ✗ Bulk earnings calendar: API error - {e}")
             return None
     
+    def _read_checkpoint(self, from_date: str, to_date: str) -> Dict[str, List[Dict]]:
+        """
+        Load per-ticker results saved by an interrupted run.
+        
+        Records from a different date range (or a truncated trailing line) are ignored.
+        
+        Returns:
+            Dict mapping ticker -> list of earnings events
+        """
+        fetched = {}
+        if not self.partial_path.exists():
+            return fetched
+        
+        with open(self.partial_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads_json(line)
+                except ValueError:
+                    continue
+                if record.get('from') == from_date and record.get('to') == to_date:
+                    fetched[record['ticker']] = record['events']
+        
+        return fetched
+    
+    def clear_checkpoint(self):
+        """Remove the per-ticker checkpoint once the final JSON is written."""
+        self.partial_path.unlink(missing_ok=True)
+    
+    def _fetch_per_ticker(self, tickers: List[str], from_date: str, to_date: str) -> List[Dict]:
+        """
+        Fetch earnings per ticker (fallback when the bulk call fails).
+        
+        Each ticker's result is appended to the JSONL checkpoint as soon as it
+        arrives, so events are not held in memory during the run and a rerun
+        skips tickers that were already fetched.
+        """
+        fetched = self._read_checkpoint(from_date, to_date)
+        if fetched:
+            print(f"↻ Resuming: {len(fetched)} ticker(s) already fetched in {self.partial_path}")
+            for events in fetched.values():
+                if events:
+                    self._record('successful', events=len(events))
+                else:
+                    self._record('no_data')
+        remaining = [t for t in tickers if t not in fetched]
+        
+        print(f"⏱️  Rate limit: {self.calls_per_minute} calls/minute")
+        
+        # Estimate time
+        estimated_minutes = len(remaining) / self.calls_per_minute
+        print(f"⏱️  Estimated time: ~{estimated_minutes:.1f} minutes\n")
+        
+        # Fetch data for each ticker; workers overlap network latency behind the shared rate gate
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                open(self.partial_path, 'ab') as partial:
+            futures = {
+                executor.submit(self.fetch_earnings_calendar, ticker, from_date, to_date): ticker
+                for ticker in remaining
+            }
+            
+            for i, future in enumerate(as_completed(futures), 1):
+                ticker = futures[future]
+                earnings_data = future.result()
+                
+                if earnings_data is not None:
+                    if earnings_data:
+                        print(f"[{i}/{len(remaining)}] ✓ {ticker}: {len(earnings_data)} earnings event(s) found")
+                    else:
+                        print(f"[{i}/{len(remaining)}] ⚠ {ticker}: No earnings data in date range")
+                    record = {'ticker': ticker, 'from': from_date, 'to': to_date, 'events': earnings_data}
+                    partial.write(dumps_json(record, indent=None) + b'\n')
+                    partial.flush()
+                # Error message already printed in fetch_earnings_calendar (not checkpointed, retried on rerun)
+        
+        # Assemble from the checkpoint
+        all_earnings = []
+        for events in self._read_checkpoint(from_date, to_date).values():
+            all_earnings.extend(events)
+        return all_earnings
+    
     def fetch_all_earnings(self) -> Dict[str, Any]:
         """
         Fetch earnings calendar data for all S&P 500 companies.
@@ -162,27 +303,26 @@ class EarningsCalendarFetcher:
         
         print(f"\n📅 Date Range: {from_date} to {to_date}")
         print(f"📊 Fetching earnings calendar for {len(tickers)} S&P 500 companies")
-        print(f"⏱️  Rate limit: {self.calls_per_minute} calls/minute")
         
-        # Estimate time
-        estimated_minutes = len(tickers) / self.calls_per_minute
-        print(f"⏱️  Estimated time: ~{estimated_minutes:.1f} minutes\n")
-        
-        # Fetch data for each ticker
-        all_earnings = []
+        # One bulk request for the whole market, filtered to the S&P 500 client-side
+        market_earnings = self.fetch_bulk_earnings_calendar(from_date, to_date)
         
-        for i, ticker in enumerate(tickers, 1):
-            print(f"[{i}/{len(tickers)}] {ticker}")
-            
-            earnings_data = self.fetch_earnings_calendar(ticker, from_date, to_date)
-            
-            if earnings_data is not None:
-                if earnings_data:
-                    print(f"  ✓ {ticker}: {len(earnings_data)} earnings event(s) found")
-                    all_earnings.extend(earnings_data)
-                else:
-                    print(f"  ⚠ {ticker}: No earnings data in date range")
-            # Error message already printed in fetch_earnings_calendar
+        if market_earnings is not None:
+            # Finnhub uses dotted share classes (BRK.B); the universe uses dashes (BRK-B)
+            spx_set = set(tickers)
+            all_earnings = [
+                e for e in market_earnings
+                if (e.get('symbol') or '').replace('.', '-') in spx_set
+            ]
+            symbols_with_data = {e['symbol'] for e in all_earnings}
+            self.stats['successful'] = len(symbols_with_data)
+            self.stats['no_data'] = len(tickers) - len(symbols_with_data)
+            self.stats['total_earnings_events'] = len(all_earnings)
+            print(f"✓ Bulk call returned {len(market_earnings)} events, "
+                  f"{len(all_earnings)} for {len(symbols_with_data)} S&P 500 companies")
+        else:
+            print("⚠ Bulk call failed, falling back to per-ticker requests")
+            all_earnings = self._fetch_per_ticker(tickers, from_date, to_date)
         
         # Sort by date (most recent first)
         all_earnings.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -244,10 +384,7 @@ class EarningsCalendarFetcher:
     
     def save_to_json(self, data: Dict, output_file: str):
         """Save data to JSON file."""
-        output_path = Path(output_file)
-        
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        output_path = write_json(data, output_file, indent=2)
         
         file_size = output_path.stat().st_size
         print(f"\n✓ Data saved to {output_file}")
@@ -280,6 +417,7 @@ def main():
     # Save to JSON
     output_file = fetcher.config['output']['earnings_calendar_file']
     fetcher.save_to_json(earnings_data, output_file)
+    fetcher.clear_checkpoint()
     
     # Print summary
     fetcher.print_summary()
@@ -15,186 +15,273 @@ Input: earnings_surprises.json
 Output: sector_earnings_surprises.json
 """
 
-import json
 import sys
-import yaml
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from shared.config_io import load_yaml_config
+from shared.earnings_cache import load_or_parse
+from shared.earnings_kernels import CATEGORY_NAMES, category_bounds, classify_codes
+from shared.json_io import write_json_stream
 from shared.sector_mapping import TICKER_TO_SECTOR, SECTOR_TO_ETF
 
+# Sector ids index this tuple, so sector-ordered output needs no sorting at run time
+SORTED_SECTORS = tuple(sorted(SECTOR_TO_ETF))
+SORTED_SECTOR_ETFS = tuple(SECTOR_TO_ETF[sector] for sector in SORTED_SECTORS)
+QUARTERS = (1, 2, 3, 4)
+
+
+# Static part of the output README, built once at import
+_README_STATIC = {
+    "description": "Earnings surprises aggregated by GICS sector with quarter-by-quarter breakdown",
+    "purpose": "Compare sector performance across fiscal quarters to identify trends and patterns",
+    "data_organization": "Each sector contains quarterly breakdowns (Q1, Q2, Q3, Q4) plus overall statistics",
+    "most_recent_quarter": None,  # filled in per run by save_to_json
+
+    "usage_guide": {
+        "quarter_comparison": "Compare Q1 across sectors to see which sectors perform best in Q1, etc.",
+        "trend_analysis": "Look at a single sector across Q1->Q2->Q3->Q4 to identify seasonal patterns",
+        "beat_rates": "Higher beat_rate = more companies in sector beating estimates",
+        "surprise_direction": "Positive average_surprise_percent = sector beating estimates on average"
+    },
+
+    "key_metrics_explained": {
+        "total_companies": "Number of S&P 500 companies in this sector reporting this quarter",
+        "average_surprise_percent": "Mean earnings surprise % across all companies in sector",
+        "beat_rate": "Percentage of companies that beat estimates (beat + strong_beat)",
+        "meet_rate": "Percentage of companies that met estimates (within ±0.5%)",
+        "miss_rate": "Percentage of companies that missed estimates (miss + strong_miss)",
+        "strong_beat_count": "Companies with >5% positive surprise",
+        "beat_count": "Companies with 0-5% positive surprise",
+        "meet_count": "Companies within ±0.5% of estimates",
+        "miss_count": "Companies with 0% to -5% negative surprise",
+        "strong_miss_count": "Companies with <-5% negative surprise",
+        "median_surprise_percent": "Median surprise (less affected by outliers than average)",
+        "max_surprise_percent": "Largest positive surprise in the sector/quarter",
+        "min_surprise_percent": "Largest negative surprise in the sector/quarter",
+        "is_most_recent": "True if this is the most recently reported quarter"
+    },
+
+    "interpretation_tips": {
+        "comparing_quarters": "Technology (XLK) Q1 vs Healthcare (XLV) Q1 shows which sector had better Q1 performance",
+        "seasonal_patterns": "Some sectors perform better in specific quarters (e.g., Retail in Q4)",
+        "beat_rate_threshold": "Beat rate >60% suggests strong sector momentum",
+        "surprise_consistency": "Low difference between median and average = consistent sector performance",
+        "recent_vs_historical": "Compare most_recent quarter to other quarters for trend direction"
+    },
+
+    "sectors": list(SECTOR_TO_ETF.keys())
+}
+
+
+@dataclass
+class SectorQuarterGroups:
+    """
+    Earnings surprises flattened to parallel arrays (SoA) and sorted by
+    (sector, quarter), so every group is one contiguous slice of `surprise_pct`.
+    """
+    sector_ids: np.ndarray    # per group: index into SORTED_SECTORS
+    quarters: np.ndarray      # per group: fiscal quarter (1-4)
+    starts: np.ndarray        # per group: offset of the group's first row
+    surprise_pct: np.ndarray  # per row: surprise percent, grouped
+    category_codes: np.ndarray  # per row: index into CATEGORY_NAMES, grouped
+    most_recent_quarter: Optional[int]  # latest reported period across the dataset
+    most_recent_year: Optional[int]
+    most_recent_period: Optional[str]
+
 
 class SectorEarningsAggregator:
     """Aggregates earnings surprises by sector with quarterly breakdowns."""
     
     def __init__(self, config_path="config.yml"):
         """Initialize aggregator with configuration."""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Parsed once per process (libyaml loader when available)
+        self.config = load_yaml_config(config_path)
         
         # Load surprise classification thresholds
         self.thresholds = self.config['surprise_classification']
-    
-    def classify_surprise(self, surprise_percent):
-        """
-        Classify earnings surprise into categories.
         
-        Args:
-            surprise_percent: Surprise percentage value
-            
-        Returns:
-            Category string: strong_beat, beat, meet, miss, strong_miss
-        """
-        if surprise_percent is None:
-            return "unknown"
+        # Category boundaries for vectorized classification (classify_codes)
+        self._category_bounds = category_bounds(self.thresholds)
         
-        if surprise_percent > self.thresholds['strong_beat_threshold']:
-            return "strong_beat"
-        elif surprise_percent > self.thresholds['beat_threshold']:
-            return "beat"
-        elif abs(surprise_percent) <= self.thresholds['meet_threshold']:
-            return "meet"
-        elif surprise_percent >= self.thresholds['miss_threshold']:
-            return "miss"
-        else:
-            return "strong_miss"
+        # Sector ids follow SORTED_SECTORS, so grouped output comes out sorted;
+        # ids are resolved once here instead of per ticker
+        self._sector_to_id = {sector: i for i, sector in enumerate(SORTED_SECTORS)}
     
     def load_earnings_data(self, input_file):
-        """Load raw earnings data from JSON file."""
-        with open(input_file, 'r') as f:
-            data = json.load(f)
-        return data['data']
+        """Load raw earnings data (parsed column arrays, cached next to the JSON file)."""
+        return load_or_parse(input_file)
     
     def aggregate_by_sector_and_quarter(self, earnings_data):
         """
         Aggregate earnings data by sector and quarter.
         
+        Groups the flat per-quarter column arrays with one argsort on a
+        composite sector_id*10+quarter key, instead of building nested dicts
+        of per-row dicts. The most recent reported quarter is picked up from
+        the same rows.
+        
+        Args:
+            earnings_data: EarningsTable from load_earnings_data
+            
         Returns:
-            Dictionary with sector -> quarter -> aggregated metrics
+            SectorQuarterGroups with rows sorted by (sector, quarter)
         """
-        # Structure: sector -> quarter -> list of surprises
-        sector_quarters = defaultdict(lambda: defaultdict(list))
+        sector_to_id = self._sector_to_id
         
-        # Organize data by sector and quarter
-        for ticker, quarters in earnings_data.items():
-            sector = TICKER_TO_SECTOR.get(ticker)
-            if not sector:
-                continue
-            
-            for q_data in quarters:
-                quarter = q_data.get('quarter')
-                year = q_data.get('year')
-                surprise_pct = q_data.get('surprisePercent')
-                
-                if quarter is None or surprise_pct is None:
-                    continue
-                
-                # Store all relevant data for this quarter
-                sector_quarters[sector][quarter].append({
-                    'ticker': ticker,
-                    'year': year,
-                    'period': q_data.get('period'),
-                    'actual': q_data.get('actual'),
-                    'estimate': q_data.get('estimate'),
-                    'surprise': q_data.get('surprise'),
-                    'surprise_percent': surprise_pct,
-                    'category': self.classify_surprise(surprise_pct)
-                })
+        # One sector id per ticker (-1 = not in the S&P 500 mapping), repeated per row
+        ticker_sector_id = np.fromiter(
+            (sector_to_id.get(TICKER_TO_SECTOR.get(ticker), -1) for ticker in earnings_data.tickers.tolist()),
+            dtype=np.int8, count=len(earnings_data)
+        )
+        sector_ids = np.repeat(ticker_sector_id, np.diff(earnings_data.offsets))
+        
+        # Missing quarters are 0 and missing surprises NaN; both are masked out below
+        quarters = earnings_data.quarter
+        surprise_pct = earnings_data.surprisePercent
+        
+        # Most recent period over all rows (ISO dates compare correctly as strings;
+        # argmax keeps the first of equal periods)
+        most_recent_quarter = most_recent_year = most_recent_period = None
+        if quarters.size:
+            latest = int(np.argmax(earnings_data.period))
+            if earnings_data.period[latest]:
+                most_recent_quarter = int(quarters[latest]) or None
+                most_recent_year = int(earnings_data.year[latest]) or None
+                most_recent_period = str(earnings_data.period[latest])
+        
+        valid = (sector_ids >= 0) & (quarters > 0) & ~np.isnan(surprise_pct)
+        key = sector_ids[valid].astype(np.int64) * 10 + quarters[valid].astype(np.int64)
         
-        return sector_quarters
+        # Stable sort keeps rows within a group in input order; groups are then just
+        # the offsets where the sorted key changes (no per-group containers)
+        order = np.argsort(key, kind='stable')
+        key = key[order]
+        starts = np.flatnonzero(np.diff(key, prepend=-1))
+        group_keys = key[starts]
+        surprise_pct = surprise_pct[valid][order]
+        
+        return SectorQuarterGroups(
+            sector_ids=group_keys // 10,
+            quarters=group_keys % 10,
+            starts=starts,
+            surprise_pct=surprise_pct,
+            category_codes=classify_codes(surprise_pct, self._category_bounds).astype(np.int8),
+            most_recent_quarter=most_recent_quarter,
+            most_recent_year=most_recent_year,
+            most_recent_period=most_recent_period,
+        )
     
-    def calculate_quarter_metrics(self, surprises_list):
+    def calculate_group_metrics(self, surprise_pct, category_codes, starts):
         """
-        Calculate aggregate metrics for a quarter's surprises.
+        Calculate aggregate metrics for every group of surprises at once.
+        
+        Sums, extremes and category counts are per-group reductions over the
+        contiguous arrays (np.add/maximum/minimum.reduceat, one np.bincount),
+        rather than separate Python passes per group.
         
         Args:
-            surprises_list: List of surprise data dicts
+            surprise_pct: Surprise percents, grouped contiguously
+            category_codes: Matching category codes
+            starts: Offset of each group's first row (non-empty groups)
             
         Returns:
-            Dictionary of calculated metrics
+            List of metric dictionaries, one per group
         """
-        if not surprises_list:
-            return None
-        
-        total_count = len(surprises_list)
+        n_groups = starts.size
+        if not n_groups:
+            return []
         
-        # Count categories
-        category_counts = defaultdict(int)
-        for item in surprises_list:
-            category_counts[item['category']] += 1
+        ends = np.append(starts[1:], surprise_pct.size)
+        lens = ends - starts
+        sums = np.add.reduceat(surprise_pct, starts)
+        maxs = np.maximum.reduceat(surprise_pct, starts)
+        mins = np.minimum.reduceat(surprise_pct, starts)
         
-        # Calculate surprise statistics
-        surprise_values = [item['surprise_percent'] for item in surprises_list]
-        avg_surprise = sum(surprise_values) / len(surprise_values)
+        # Category counts for all groups from one bincount over group*5+code
+        n_categories = len(CATEGORY_NAMES)
+        group_ids = np.repeat(np.arange(n_groups), lens)
+        category_counts = np.bincount(
+            group_ids * n_categories + category_codes, minlength=n_groups * n_categories
+        ).reshape(n_groups, n_categories)
         
-        # Calculate beat/miss/meet rates
-        beat_count = category_counts['strong_beat'] + category_counts['beat']
-        meet_count = category_counts['meet']
-        miss_count = category_counts['miss'] + category_counts['strong_miss']
-        
-        return {
-            'total_companies': total_count,
-            'average_surprise_percent': round(avg_surprise, 2),
-            'beat_rate': round((beat_count / total_count) * 100, 1),
-            'meet_rate': round((meet_count / total_count) * 100, 1),
-            'miss_rate': round((miss_count / total_count) * 100, 1),
-            'strong_beat_count': category_counts['strong_beat'],
-            'beat_count': category_counts['beat'],
-            'meet_count': category_counts['meet'],
-            'miss_count': category_counts['miss'],
-            'strong_miss_count': category_counts['strong_miss'],
-            'median_surprise_percent': round(sorted(surprise_values)[len(surprise_values)//2], 2),
-            'max_surprise_percent': round(max(surprise_values), 2),
-            'min_surprise_percent': round(min(surprise_values), 2)
-        }
-    
-    def get_most_recent_quarter(self, earnings_data):
-        """Determine the most recent quarter from the dataset."""
-        max_period = None
-        max_quarter = None
-        max_year = None
-        
-        for ticker, quarters in earnings_data.items():
-            for q_data in quarters:
-                period = q_data.get('period')
-                if period and (max_period is None or period > max_period):
-                    max_period = period
-                    max_quarter = q_data.get('quarter')
-                    max_year = q_data.get('year')
+        metrics = []
+        for start, end, total_count, total, max_surprise, min_surprise, counts in zip(
+            starts.tolist(), ends.tolist(), lens.tolist(), sums.tolist(),
+            maxs.tolist(), mins.tolist(), category_counts.tolist()
+        ):
+            strong_miss, miss, meet, beat, strong_beat = counts
+            
+            # Calculate beat/miss/meet rates
+            beat_count = strong_beat + beat
+            miss_count = miss + strong_miss
+            # Upper median via quickselect (O(n)) rather than a full sort
+            mid = total_count // 2
+            median = float(np.partition(surprise_pct[start:end], mid)[mid])
+            
+            metrics.append({
+                'total_companies': total_count,
+                'average_surprise_percent': round(total / total_count, 2),
+                'beat_rate': round((beat_count / total_count) * 100, 1),
+                'meet_rate': round((meet / total_count) * 100, 1),
+                'miss_rate': round((miss_count / total_count) * 100, 1),
+                'strong_beat_count': strong_beat,
+                'beat_count': beat,
+                'meet_count': meet,
+                'miss_count': miss,
+                'strong_miss_count': strong_miss,
+                'median_surprise_percent': round(median, 2),
+                'max_surprise_percent': round(max_surprise, 2),
+                'min_surprise_percent': round(min_surprise, 2)
+            })
         
-        return max_quarter, max_year, max_period
+        return metrics
     
-    def format_output(self, sector_quarters, most_recent_quarter, most_recent_year):
+    def format_output(self, groups, most_recent_quarter, most_recent_year):
         """Format aggregated data for JSON output."""
         output_sectors = {}
         
-        for sector, quarters_data in sorted(sector_quarters.items()):
+        # A sector's quarter groups (and rows) are contiguous, so sector-wide
+        # statistics are the same reductions over the sectors' first-group offsets
+        n_groups = groups.starts.size
+        sector_first = np.flatnonzero(np.diff(groups.sector_ids, prepend=-1))
+        sector_last = np.append(sector_first[1:], n_groups)
+        
+        quarter_metrics = self.calculate_group_metrics(
+            groups.surprise_pct, groups.category_codes, groups.starts
+        )
+        sector_metrics = self.calculate_group_metrics(
+            groups.surprise_pct, groups.category_codes, groups.starts[sector_first]
+        )
+        sector_ids = groups.sector_ids.tolist()
+        quarters = groups.quarters.tolist()
+        
+        for first, last, overall_metrics in zip(sector_first.tolist(), sector_last.tolist(),
+                                                sector_metrics):
+            sector_id = sector_ids[first]
+            sector = SORTED_SECTORS[sector_id]
             sector_info = {
                 'sector_name': sector,
-                'etf_symbol': SECTOR_TO_ETF.get(sector, 'N/A'),
+                'etf_symbol': SORTED_SECTOR_ETFS[sector_id],
                 'quarters': {}
             }
             
             # Process each quarter (Q1, Q2, Q3, Q4)
-            for quarter in sorted(quarters_data.keys()):
-                metrics = self.calculate_quarter_metrics(quarters_data[quarter])
-                
-                if metrics:
-                    quarter_key = f"Q{quarter}"
-                    sector_info['quarters'][quarter_key] = {
-                        **metrics,
-                        'is_most_recent': (quarter == most_recent_quarter)
-                    }
+            for group in range(first, last):
+                quarter = quarters[group]
+                quarter_key = f"Q{quarter}"
+                sector_info['quarters'][quarter_key] = {
+                    **quarter_metrics[group],
+                    'is_most_recent': (quarter == most_recent_quarter)
+                }
             
-            # Calculate overall sector statistics (across all quarters)
-            all_surprises = []
-            for quarter_data in quarters_data.values():
-                all_surprises.extend(quarter_data)
-            
-            overall_metrics = self.calculate_quarter_metrics(all_surprises)
+            # Overall sector statistics (across all quarters)
             sector_info['overall_statistics'] = overall_metrics
             
             output_sectors[sector] = sector_info
@@ -203,52 +290,11 @@ class SectorEarningsAggregator:
     
     def save_to_json(self, sector_data, most_recent_quarter, most_recent_year, most_recent_period, output_file):
         """Save sector aggregation to JSON with detailed README."""
-        
-        readme = {
+        head = {
             "_README": {
-                "description": "Earnings surprises aggregated by GICS sector with quarter-by-quarter breakdown",
-                "purpose": "Compare sector performance across fiscal quarters to identify trends and patterns",
-                "data_organization": "Each sector contains quarterly breakdowns (Q1, Q2, Q3, Q4) plus overall statistics",
+                **_README_STATIC,
                 "most_recent_quarter": f"Q{most_recent_quarter} {most_recent_year} (period ending {most_recent_period})",
-                
-                "usage_guide": {
-                    "quarter_comparison": "Compare Q1 across sectors to see which sectors perform best in Q1, etc.",
-                    "trend_analysis": "Look at a single sector across Q1->Q2->Q3->Q4 to identify seasonal patterns",
-                    "beat_rates": "Higher beat_rate = more companies in sector beating estimates",
-                    "surprise_direction": "Positive average_surprise_percent = sector beating estimates on average"
-                },
-                
-                "key_metrics_explained": {
-                    "total_companies": "Number of S&P 500 companies in this sector reporting this quarter",
-                    "average_surprise_percent": "Mean earnings surprise % across all companies in sector",
-                    "beat_rate": "Percentage of companies that beat estimates (beat + strong_beat)",
-                    "meet_rate": "Percentage of companies that met estimates (within ±0.5%)",
-                    "miss_rate": "Percentage of companies that missed estimates (miss + strong_miss)",
-                    "strong_beat_count": "Companies with >5% positive surprise",
-                    "beat_count": "Companies with 0-5% positive surprise",
-                    "meet_count": "Companies within ±0.5% of estimates",
-                    "miss_count": "Companies with 0% to -5% negative surprise",
-                    "strong_miss_count": "Companies with <-5% negative surprise",
-                    "median_surprise_percent": "Median surprise (less affected by outliers than average)",
-                    "max_surprise_percent": "Largest positive surprise in the sector/quarter",
-                    "min_surprise_percent": "Largest negative surprise in the sector/quarter",
-                    "is_most_recent": "True if this is the most recently reported quarter"
-                },
-                
-                "interpretation_tips": {
-                    "comparing_quarters": "Technology (XLK) Q1 vs Healthcare (XLV) Q1 shows which sector had better Q1 performance",
-                    "seasonal_patterns": "Some sectors perform better in specific quarters (e.g., Retail in Q4)",
-                    "beat_rate_threshold": "Beat rate >60% suggests strong sector momentum",
-                    "surprise_consistency": "Low difference between median and average = consistent sector performance",
-                    "recent_vs_historical": "Compare most_recent quarter to other quarters for trend direction"
-                },
-                
-                "sectors": list(SECTOR_TO_ETF.keys())
-            }
-        }
-        
-        output = {
-            **readme,
+            },
             "metadata": {
                 "data_source": "Finnhub Earnings Surprises API",
                 "aggregation_level": "GICS Sector",
@@ -257,7 +303,7 @@ class SectorEarningsAggregator:
                 "most_recent_quarter": f"Q{most_recent_quarter}",
                 "most_recent_year": most_recent_year,
                 "most_recent_period": most_recent_period,
-                "quarters_analyzed": ["Q1", "Q2", "Q3", "Q4"]
+                "quarters_analyzed": [f"Q{quarter}" for quarter in QUARTERS]
             },
             "surprise_classification": {
                 "strong_beat": f"> {self.thresholds['strong_beat_threshold']}%",
@@ -265,12 +311,11 @@ class SectorEarningsAggregator:
                 "meet": f"± {self.thresholds['meet_threshold']}%",
                 "miss": f"{self.thresholds['miss_threshold']}% to 0%",
                 "strong_miss": f"< {self.thresholds['miss_threshold']}%"
-            },
-            "sectors": sector_data
+            }
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(output, f, indent=2)
+        # Sectors are encoded and written one at a time after the head fields
+        write_json_stream(head, "sectors", sector_data.items(), output_file, indent=2)
         
         file_size = Path(output_file).stat().st_size
         print(f"\n✓ Sector aggregation saved to {output_file}")
@@ -292,17 +337,17 @@ def main():
     earnings_data = aggregator.load_earnings_data(input_file)
     print(f"✓ Loaded data for {len(earnings_data)} tickers")
     
-    # Get most recent quarter info
-    most_recent_q, most_recent_y, most_recent_p = aggregator.get_most_recent_quarter(earnings_data)
-    print(f"✓ Most recent quarter: Q{most_recent_q} {most_recent_y} (period: {most_recent_p})")
-    
-    # Aggregate by sector and quarter
+    # Aggregate by sector and quarter (also finds the most recent quarter)
     print("\nAggregating by sector and quarter...")
-    sector_quarters = aggregator.aggregate_by_sector_and_quarter(earnings_data)
+    groups = aggregator.aggregate_by_sector_and_quarter(earnings_data)
+    most_recent_q = groups.most_recent_quarter
+    most_recent_y = groups.most_recent_year
+    most_recent_p = groups.most_recent_period
+    print(f"✓ Most recent quarter: Q{most_recent_q} {most_recent_y} (period: {most_recent_p})")
     
     # Format output
     print("Calculating metrics...")
-    sector_data = aggregator.format_output(sector_quarters, most_recent_q, most_recent_y)
+    sector_data = aggregator.format_output(groups, most_recent_q, most_recent_y)
     
     # Save to JSON
     output_file = aggregator.config['output']['sector_aggregation']
@@ -312,8 +357,8 @@ def main():
     print("\n" + "=" * 70)
     print("SECTOR AGGREGATION SUMMARY")
     print("=" * 70)
-    for sector in sorted(sector_data.keys()):
-        info = sector_data[sector]
+    # sector_data is already in sector name order
+    for sector, info in sector_data.items():
         overall = info['overall_statistics']
         print(f"{sector:25s} | Avg Surprise: {overall['average_surprise_percent']:+6.2f}% | "
               f"Beat Rate: {overall['beat_rate']:5.1f}% | Companies: {overall['total_companies']}")
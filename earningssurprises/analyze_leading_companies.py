@@ -13,12 +13,18 @@ Features:
 Output: leading_companies_by_sector.json
 """
 
-import json
-import yaml
+import sys
 from pathlib import Path
 from datetime import datetime
-from statistics import mean, stdev
 
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.config_io import load_yaml_config
+from shared.earnings_cache import load_or_parse
+from shared.earnings_kernels import CATEGORY_NAMES, beat_streak, category_bounds, classify_codes, njit
+from shared.json_io import write_json
 
 # Leading companies by sector (same as analysttrends)
 SECTOR_LEADING_COMPANIES = {
@@ -35,93 +41,169 @@ SECTOR_LEADING_COMPANIES = {
     "Materials": ["LIN", "APD", "SHW", "FCX", "NEM", "DD"]
 }
 
+# Summary print order, sorted once at import
+SORTED_LEADING_SECTORS = tuple(sorted(SECTOR_LEADING_COMPANIES))
+
+
+# Output README (static), built once at import
+_README = {
+    "description": "Earnings surprises for market-leading companies grouped by sector",
+    "purpose": "Track earnings performance of the biggest players in each sector",
+
+    "company_selection": "5-6 largest/most influential companies per sector based on market cap and sector representation",
+
+    "data_organization": {
+        "sector_statistics": "Aggregated metrics across all leading companies in the sector",
+        "companies": "Individual company data sorted by average_surprise_percent (best to worst)"
+    },
+
+    "sector_statistics_explained": {
+        "total_companies": "Number of leading companies analyzed in this sector",
+        "average_surprise_percent": "Mean surprise % across all sector leaders",
+        "average_beat_rate": "Mean beat rate across all sector leaders",
+        "best_performer": "Highest average surprise % in the sector",
+        "worst_performer": "Lowest average surprise % in the sector"
+    },
+
+    "company_metrics_explained": {
+        "ticker": "Stock ticker symbol",
+        "quarters_analyzed": "Number of quarters included (typically 4)",
+        "average_surprise_percent": "Mean earnings surprise % across all quarters",
+        "beat_rate": "Percentage of quarters beating estimates",
+        "beat_streak": "Consecutive quarters beating (positive) or missing (negative)",
+        "trend_direction": "improving/declining/stable based on recent vs older performance",
+        "consistency_score": "Standard deviation (lower = more predictable)",
+        "most_recent_quarter": "Latest reported quarter details",
+        "category_breakdown": "Count of quarters in each surprise category",
+        "quarterly_history": "Full quarter-by-quarter history (most recent first)"
+    },
+
+    "usage_examples": {
+        "sector_comparison": "Compare sector_statistics.average_surprise_percent across sectors",
+        "finding_leaders": "Companies sorted within each sector by performance",
+        "consistency_check": "Low consistency_score + high beat_rate = reliable performer",
+        "momentum_tracking": "beat_streak shows current momentum direction",
+        "quarterly_trends": "Review quarterly_history to see improvement/decline patterns"
+    },
+
+    "interpretation_tips": {
+        "sector_divergence": "If sector avg is positive but some companies negative, check for competitive issues",
+        "consistent_beaters": "Look for beat_rate >75% AND consistency_score <5",
+        "turnaround_plays": "Companies with trend_direction='improving' despite low avg_surprise",
+        "risk_signals": "beat_streak <=-2 combined with trend_direction='declining' = caution"
+    }
+}
+
+
+# Explicit signature: compiled eagerly at import and cached on disk (__pycache__),
+# so only the first run after a change pays the compile
+@njit('Tuple((float64, float64, int64, float64))(float64[:], float64)', cache=True, nogil=True)
+def surprise_stats(surprises_desc, beat_threshold):
+    """
+    Per-company surprise statistics in one kernel call.
+    
+    Sums run in the same element order as the NumPy reductions they replace, so
+    results are bit-identical for the usual 4-quarter history.
+    
+    Args:
+        surprises_desc: float64 array of surprise percents, most recent first (no NaN)
+        beat_threshold: Surprises above this are beats (incl. strong beats)
+        
+    Returns:
+        (mean, sample standard deviation, beat count, recent-half minus
+        older-half average); std and the half difference are NaN for fewer
+        than 2 values
+    """
+    n = surprises_desc.shape[0]
+    total = 0.0
+    beats = 0
+    for i in range(n):
+        total += surprises_desc[i]
+        if surprises_desc[i] > beat_threshold:
+            beats += 1
+    mean = total / n
+    if n < 2:
+        return mean, np.nan, beats, np.nan
+    
+    squares = 0.0
+    for i in range(n):
+        dev = surprises_desc[i] - mean
+        squares += dev * dev
+    std = np.sqrt(squares / (n - 1))
+    
+    # Halves in oldest-first order: the older half is the last `mid` values here
+    mid = n // 2
+    older = 0.0
+    for i in range(n - 1, n - 1 - mid, -1):
+        older += surprises_desc[i]
+    recent = 0.0
+    for i in range(n - mid - 1, -1, -1):
+        recent += surprises_desc[i]
+    return mean, std, beats, recent / (n - mid) - older / mid
+
 
 class LeadingCompaniesAnalyzer:
     """Analyzes earnings surprises for sector-leading companies."""
     
     def __init__(self, config_path="config.yml"):
         """Initialize analyzer with configuration."""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Parsed once per process (libyaml loader when available)
+        self.config = load_yaml_config(config_path)
         
         self.thresholds = self.config['surprise_classification']
+        
+        # Thresholds hoisted to float attributes for the per-value classification paths
+        self._strong_beat_threshold = float(self.thresholds['strong_beat_threshold'])
+        self._beat_threshold = float(self.thresholds['beat_threshold'])
+        self._meet_threshold = float(self.thresholds['meet_threshold'])
+        self._miss_threshold = float(self.thresholds['miss_threshold'])
+        
+        # Category boundaries for the vectorized classify_codes
+        self._category_bounds = category_bounds(self.thresholds)
     
     def load_earnings_data(self, input_file):
-        """Load raw earnings data from JSON file."""
-        with open(input_file, 'r') as f:
-            data = json.load(f)
-        return data['data']
+        """Load raw earnings data (parsed column arrays, cached next to the JSON file)."""
+        return load_or_parse(input_file)
     
     def classify_surprise(self, surprise_percent):
         """Classify earnings surprise into category."""
         if surprise_percent is None:
             return "unknown"
         
-        if surprise_percent > self.thresholds['strong_beat_threshold']:
+        if surprise_percent > self._strong_beat_threshold:
             return "strong_beat"
-        elif surprise_percent > self.thresholds['beat_threshold']:
+        elif surprise_percent > self._beat_threshold:
             return "beat"
-        elif abs(surprise_percent) <= self.thresholds['meet_threshold']:
+        elif abs(surprise_percent) <= self._meet_threshold:
             return "meet"
-        elif surprise_percent >= self.thresholds['miss_threshold']:
+        elif surprise_percent >= self._miss_threshold:
             return "miss"
         else:
             return "strong_miss"
     
-    def calculate_beat_streak(self, quarters_data):
-        """Calculate current beat streak."""
-        sorted_quarters = sorted(quarters_data, key=lambda x: x.get('period', ''), reverse=True)
-        
-        if not sorted_quarters:
-            return 0
-        
-        streak = 0
-        last_category = None
-        
-        for q in sorted_quarters:
-            surprise_pct = q.get('surprisePercent')
-            if surprise_pct is None:
-                break
-            
-            category = self.classify_surprise(surprise_pct)
-            
-            if category in ['strong_beat', 'beat']:
-                if last_category is None or last_category in ['strong_beat', 'beat']:
-                    streak += 1
-                    last_category = 'beat'
-                else:
-                    break
-            elif category in ['miss', 'strong_miss']:
-                if last_category is None or last_category in ['miss', 'strong_miss']:
-                    streak -= 1
-                    last_category = 'miss'
-                else:
-                    break
-            else:
-                break
+    def calculate_beat_streak(self, surprises_desc):
+        """
+        Calculate current beat streak.
         
-        return streak
+        Args:
+            surprises_desc: float64 array of surprise percents, most recent first (NaN = missing)
+        """
+        return int(beat_streak(surprises_desc, self._beat_threshold, self._meet_threshold))
     
-    def calculate_trend_direction(self, quarters_data):
-        """Calculate trend direction."""
-        if len(quarters_data) < 2:
-            return "insufficient_data"
+    def calculate_trend_direction(self, trend_diff):
+        """
+        Calculate trend direction.
         
-        sorted_quarters = sorted(quarters_data, key=lambda x: x.get('period', ''))
-        surprises = [q.get('surprisePercent') for q in sorted_quarters if q.get('surprisePercent') is not None]
-        
-        if len(surprises) < 2:
+        Args:
+            trend_diff: Recent-half minus older-half average surprise
+                        (NaN = fewer than 2 surprises)
+        """
+        if trend_diff != trend_diff:
             return "insufficient_data"
         
-        mid = len(surprises) // 2
-        older_avg = mean(surprises[:mid])
-        recent_avg = mean(surprises[mid:])
-        
-        diff = recent_avg - older_avg
-        
-        if diff > 2.0:
+        if trend_diff > 2.0:
             return "improving"
-        elif diff < -2.0:
+        elif trend_diff < -2.0:
             return "declining"
         else:
             return "stable"
@@ -131,31 +213,34 @@ class LeadingCompaniesAnalyzer:
         if not quarters_data:
             return None
         
-        surprises = [q.get('surprisePercent') for q in quarters_data if q.get('surprisePercent') is not None]
+        # Sort once, most recent first; stats, streak, trend, most recent quarter
+        # and history all read this order
+        sorted_quarters = sorted(quarters_data, key=lambda x: x.get('period') or '', reverse=True)
+        surprises_desc = np.array([q.get('surprisePercent') for q in sorted_quarters], dtype=np.float64)
+        surprises_arr = surprises_desc[~np.isnan(surprises_desc)]
         
-        if not surprises:
+        if not surprises_arr.size:
             return None
         
-        # Calculate metrics
-        avg_surprise = mean(surprises)
-        beats = sum(1 for s in surprises if s > self.thresholds['beat_threshold'])
-        beat_rate = (beats / len(surprises)) * 100
-        consistency_score = stdev(surprises) if len(surprises) > 1 else 0
-        beat_streak = self.calculate_beat_streak(quarters_data)
-        trend = self.calculate_trend_direction(quarters_data)
+        # Calculate metrics (mean, std, beats and trend halves in one kernel call)
+        avg_surprise, std, beats, trend_diff = surprise_stats(surprises_arr, self._beat_threshold)
+        avg_surprise = float(avg_surprise)
+        beat_rate = (int(beats) / surprises_arr.size) * 100
+        consistency_score = float(std) if surprises_arr.size > 1 else 0
+        beat_streak = self.calculate_beat_streak(surprises_desc)
+        trend = self.calculate_trend_direction(trend_diff)
         
-        # Get most recent quarter
-        most_recent = max(quarters_data, key=lambda x: x.get('period', ''))
+        # Most recent quarter is the head of the sorted list
+        most_recent = sorted_quarters[0]
+        most_recent_has_surprise = not np.isnan(surprises_desc[0])
         
-        # Category breakdown
-        categories = [self.classify_surprise(s) for s in surprises]
-        category_counts = {
-            'strong_beat': categories.count('strong_beat'),
-            'beat': categories.count('beat'),
-            'meet': categories.count('meet'),
-            'miss': categories.count('miss'),
-            'strong_miss': categories.count('strong_miss')
-        }
+        # Category breakdown (one vectorized classification + bincount, strong_beat first)
+        codes = classify_codes(surprises_arr, self._category_bounds)
+        counts = np.bincount(codes, minlength=len(CATEGORY_NAMES)).tolist()
+        category_counts = dict(zip(CATEGORY_NAMES[::-1], counts[::-1]))
+        
+        # A valid most recent surprise is the first classified value, so reuse its code
+        most_recent_category = CATEGORY_NAMES[codes[0]] if most_recent_has_surprise else "unknown"
         
         return {
             'ticker': ticker,
@@ -173,7 +258,7 @@ class LeadingCompaniesAnalyzer:
                 'estimate': most_recent.get('estimate'),
                 'surprise': most_recent.get('surprise'),
                 'surprise_percent': most_recent.get('surprisePercent'),
-                'category': self.classify_surprise(most_recent.get('surprisePercent'))
+                'category': most_recent_category
             },
             'category_breakdown': category_counts,
             'quarterly_history': [
@@ -187,41 +272,54 @@ class LeadingCompaniesAnalyzer:
                     'surprise_percent': q.get('surprisePercent'),
                     'category': self.classify_surprise(q.get('surprisePercent'))
                 }
-                for q in sorted(quarters_data, key=lambda x: x.get('period', ''), reverse=True)
+                for q in sorted_quarters
             ]
         }
     
+    def analyze_sector(self, companies, earnings_data):
+        """
+        Analyze one sector's leading companies.
+        
+        Returns:
+            Sector statistics and company analyses, or None if no company has data
+        """
+        sector_companies = []
+        
+        for ticker in companies:
+            if ticker in earnings_data:
+                analysis = self.analyze_company(ticker, earnings_data.ticker_rows(ticker))
+                if analysis:
+                    sector_companies.append(analysis)
+        
+        if not sector_companies:
+            return None
+        
+        # Sort by average surprise percent (descending)
+        sector_companies.sort(key=lambda x: x['average_surprise_percent'], reverse=True)
+        
+        # Calculate sector-level statistics
+        avg_surprises = [c['average_surprise_percent'] for c in sector_companies]
+        beat_rates = [c['beat_rate'] for c in sector_companies]
+        
+        return {
+            'sector_statistics': {
+                'total_companies': len(sector_companies),
+                'average_surprise_percent': round(float(np.mean(avg_surprises)), 2),
+                'average_beat_rate': round(float(np.mean(beat_rates)), 1),
+                'best_performer': max(avg_surprises),
+                'worst_performer': min(avg_surprises)
+            },
+            'companies': sector_companies
+        }
+    
     def extract_leading_companies(self, earnings_data):
         """Extract and analyze leading companies by sector."""
         sectors_data = {}
         
         for sector, companies in SECTOR_LEADING_COMPANIES.items():
-            sector_companies = []
-            
-            for ticker in companies:
-                if ticker in earnings_data:
-                    analysis = self.analyze_company(ticker, earnings_data[ticker])
-                    if analysis:
-                        sector_companies.append(analysis)
-            
-            if sector_companies:
-                # Sort by average surprise percent (descending)
-                sector_companies.sort(key=lambda x: x['average_surprise_percent'], reverse=True)
-                
-                # Calculate sector-level statistics
-                avg_surprises = [c['average_surprise_percent'] for c in sector_companies]
-                beat_rates = [c['beat_rate'] for c in sector_companies]
-                
-                sectors_data[sector] = {
-                    'sector_statistics': {
-                        'total_companies': len(sector_companies),
-                        'average_surprise_percent': round(mean(avg_surprises), 2),
-                        'average_beat_rate': round(mean(beat_rates), 1),
-                        'best_performer': max(avg_surprises),
-                        'worst_performer': min(avg_surprises)
-                    },
-                    'companies': sector_companies
-                }
+            sector_info = self.analyze_sector(companies, earnings_data)
+            if sector_info:
+                sectors_data[sector] = sector_info
         
         return sectors_data
     
@@ -231,7 +329,10 @@ class LeadingCompaniesAnalyzer:
         print("LEADING COMPANIES BY SECTOR")
         print("=" * 70)
         
-        for sector, data in sorted(sectors_data.items()):
+        for sector in SORTED_LEADING_SECTORS:
+            data = sectors_data.get(sector)
+            if data is None:
+                continue
             stats = data['sector_statistics']
             print(f"\n{sector}")
             print(f"  Sector Avg Surprise: {stats['average_surprise_percent']:+.2f}%")
@@ -247,59 +348,8 @@ class LeadingCompaniesAnalyzer:
     
     def save_to_json(self, sectors_data, output_file):
         """Save leading companies analysis to JSON with README."""
-        
-        readme = {
-            "_README": {
-                "description": "Earnings surprises for market-leading companies grouped by sector",
-                "purpose": "Track earnings performance of the biggest players in each sector",
-                
-                "company_selection": "5-6 largest/most influential companies per sector based on market cap and sector representation",
-                
-                "data_organization": {
-                    "sector_statistics": "Aggregated metrics across all leading companies in the sector",
-                    "companies": "Individual company data sorted by average_surprise_percent (best to worst)"
-                },
-                
-                "sector_statistics_explained": {
-                    "total_companies": "Number of leading companies analyzed in this sector",
-                    "average_surprise_percent": "Mean surprise % across all sector leaders",
-                    "average_beat_rate": "Mean beat rate across all sector leaders",
-                    "best_performer": "Highest average surprise % in the sector",
-                    "worst_performer": "Lowest average surprise % in the sector"
-                },
-                
-                "company_metrics_explained": {
-                    "ticker": "Stock ticker symbol",
-                    "quarters_analyzed": "Number of quarters included (typically 4)",
-                    "average_surprise_percent": "Mean earnings surprise % across all quarters",
-                    "beat_rate": "Percentage of quarters beating estimates",
-                    "beat_streak": "Consecutive quarters beating (positive) or missing (negative)",
-                    "trend_direction": "improving/declining/stable based on recent vs older performance",
-                    "consistency_score": "Standard deviation (lower = more predictable)",
-                    "most_recent_quarter": "Latest reported quarter details",
-                    "category_breakdown": "Count of quarters in each surprise category",
-                    "quarterly_history": "Full quarter-by-quarter history (most recent first)"
-                },
-                
-                "usage_examples": {
-                    "sector_comparison": "Compare sector_statistics.average_surprise_percent across sectors",
-                    "finding_leaders": "Companies sorted within each sector by performance",
-                    "consistency_check": "Low consistency_score + high beat_rate = reliable performer",
-                    "momentum_tracking": "beat_streak shows current momentum direction",
-                    "quarterly_trends": "Review quarterly_history to see improvement/decline patterns"
-                },
-                
-                "interpretation_tips": {
-                    "sector_divergence": "If sector avg is positive but some companies negative, check for competitive issues",
-                    "consistent_beaters": "Look for beat_rate >75% AND consistency_score <5",
-                    "turnaround_plays": "Companies with trend_direction='improving' despite low avg_surprise",
-                    "risk_signals": "beat_streak <=-2 combined with trend_direction='declining' = caution"
-                }
-            }
-        }
-        
         output = {
-            **readme,
+            "_README": _README,
             "metadata": {
                 "data_source": "Finnhub Earnings Surprises API",
                 "analysis_type": "Leading Companies by Sector",
@@ -317,8 +367,7 @@ class LeadingCompaniesAnalyzer:
             "sectors": sectors_data
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(output, f, indent=2)
+        write_json(output, output_file, indent=2)
         
         file_size = Path(output_file).stat().st_size
         print(f"\n✓ Leading companies analysis saved to {output_file}")
@@ -15,114 +15,149 @@ Metrics Tracked:
 Output: Top 25 best performers and bottom 25 worst performers
 """
 
-import json
 import sys
-import yaml
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from datetime import datetime
-from statistics import mean, stdev
+from itertools import repeat
+
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from shared.config_io import load_yaml_config
+from shared.earnings_cache import INT_MASK, column_to_list, load_or_parse
+from shared.earnings_kernels import CATEGORY_NAMES, beat_streak, category_bounds, classify_codes, njit
+from shared.json_io import write_json
 from shared.sector_mapping import TICKER_TO_SECTOR
 
+# Per-quarter labels: code -1 (no surprise percent) indexes the trailing "unknown"
+CATEGORY_LABELS = CATEGORY_NAMES + ('unknown',)
+
+# quarterly_details record layout: output keys, and the raw columns feeding all but 'category'
+QUARTER_DETAIL_KEYS = ('period', 'quarter', 'year', 'actual', 'estimate', 'surprise',
+                       'surprise_percent', 'category')
+QUARTER_DETAIL_COLUMNS = ('period', 'quarter', 'year', 'actual', 'estimate', 'surprise',
+                          'surprisePercent')
+
+# Explicit signature: compiled eagerly at import and cached on disk (__pycache__),
+# so only the first run after a change pays the compile
+@njit('UniTuple(float64, 2)(float64[:])', cache=True, nogil=True)
+def mean_std(values):
+    """
+    Mean and sample standard deviation in one pass (Welford's online update).
+    
+    Args:
+        values: float64 array (no NaN, at least one value)
+        
+    Returns:
+        (mean, std); std is 0.0 for a single value
+    """
+    mean = 0.0
+    m2 = 0.0
+    n = 0
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+    return mean, std
+
+
+def ticker_sectors(tickers):
+    """Sector of each ticker ('Unknown' if unmapped), in one pass over the ticker list."""
+    return list(map(TICKER_TO_SECTOR.get, tickers, repeat('Unknown', len(tickers))))
+
+
+def average_surprises(ticker_analyses):
+    """average_surprise_percent of each ticker analysis as a float64 array."""
+    return np.fromiter((t['average_surprise_percent'] for t in ticker_analyses),
+                       dtype=np.float64, count=len(ticker_analyses))
+
+
+def top_n_indices(values, n):
+    """
+    Indices of the n largest values, largest first, without a full sort.
+    
+    Ties keep index order (and the boundary tie goes to the lower index), so the
+    result equals the head of a stable descending sort.
+    """
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n >= len(values):
+        return np.argsort(-values, kind='stable')
+    
+    # n-th largest value via introselect; everything above it is in, ties fill the rest
+    kth = np.partition(values, len(values) - n)[len(values) - n]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:n - len(above)]
+    selected = np.concatenate((above, ties))
+    return selected[np.argsort(-values[selected], kind='stable')]
+
 
 class TickerSurprisesAnalyzer:
     """Analyzes ticker-level earnings surprises with comprehensive metrics."""
     
     def __init__(self, config_path="config.yml"):
         """Initialize analyzer with configuration."""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Parsed once per process (libyaml loader when available)
+        self.config = load_yaml_config(config_path)
         
         self.top_n = self.config['analysis']['top_movers_count']
         self.thresholds = self.config['surprise_classification']
+        
+        # Category boundaries: arrays feed the vectorized classify_codes, tuples of
+        # the same edges the scalar bisect in classify_surprise
+        self._category_bounds = category_bounds(self.thresholds)
+        self._closed_edges, self._open_edges = (tuple(bounds.tolist()) for bounds in self._category_bounds)
     
     def load_earnings_data(self, input_file):
-        """Load raw earnings data from JSON file."""
-        with open(input_file, 'r') as f:
-            data = json.load(f)
-        return data['data']
+        """Load raw earnings data (parsed column arrays, cached next to the JSON file)."""
+        return load_or_parse(input_file)
     
     def classify_surprise(self, surprise_percent):
         """Classify earnings surprise into category."""
         if surprise_percent is None:
             return "unknown"
         
-        if surprise_percent > self.thresholds['strong_beat_threshold']:
-            return "strong_beat"
-        elif surprise_percent > self.thresholds['beat_threshold']:
-            return "beat"
-        elif abs(surprise_percent) <= self.thresholds['meet_threshold']:
-            return "meet"
-        elif surprise_percent >= self.thresholds['miss_threshold']:
-            return "miss"
-        else:
-            return "strong_miss"
+        # Category code = inclusive edges at or below + exclusive edges below the value
+        return CATEGORY_NAMES[bisect_right(self._closed_edges, surprise_percent)
+                              + bisect_left(self._open_edges, surprise_percent)]
     
-    def calculate_beat_streak(self, quarters_data):
+    def calculate_beat_streak(self, surprises_desc):
         """
         Calculate current beat streak (consecutive quarters beating estimates).
         
+        Args:
+            surprises_desc: float64 array of surprise percents, most recent first (NaN = missing)
+        
         Returns:
             Positive number for beat streak, negative for miss streak, 0 for no streak
         """
-        # Sort by period (most recent first)
-        sorted_quarters = sorted(quarters_data, key=lambda x: x.get('period', ''), reverse=True)
-        
-        if not sorted_quarters:
-            return 0
-        
-        streak = 0
-        last_category = None
-        
-        for q in sorted_quarters:
-            surprise_pct = q.get('surprisePercent')
-            if surprise_pct is None:
-                break
-            
-            category = self.classify_surprise(surprise_pct)
-            
-            if category in ['strong_beat', 'beat']:
-                if last_category is None or last_category in ['strong_beat', 'beat']:
-                    streak += 1
-                    last_category = 'beat'
-                else:
-                    break
-            elif category in ['miss', 'strong_miss']:
-                if last_category is None or last_category in ['miss', 'strong_miss']:
-                    streak -= 1
-                    last_category = 'miss'
-                else:
-                    break
-            else:  # meet
-                break
-        
-        return streak
+        return int(beat_streak(surprises_desc, float(self.thresholds['beat_threshold']),
+                               float(self.thresholds['meet_threshold'])))
     
-    def calculate_trend_direction(self, quarters_data):
+    def calculate_trend_direction(self, surprises_asc):
         """
         Calculate trend direction (improving/declining/stable).
         
         Compares older quarters to recent quarters.
-        Returns: "improving", "declining", or "stable"
-        """
-        if len(quarters_data) < 2:
-            return "insufficient_data"
         
-        # Sort by period
-        sorted_quarters = sorted(quarters_data, key=lambda x: x.get('period', ''))
-        surprises = [q.get('surprisePercent') for q in sorted_quarters if q.get('surprisePercent') is not None]
+        Args:
+            surprises_asc: float64 array of surprise percents, oldest first (missing values dropped)
         
-        if len(surprises) < 2:
+        Returns: "improving", "declining", "stable" or "insufficient_data"
+        """
+        if len(surprises_asc) < 2:
             return "insufficient_data"
         
         # Split into older half and recent half
-        mid = len(surprises) // 2
-        older_avg = mean(surprises[:mid])
-        recent_avg = mean(surprises[mid:])
+        mid = len(surprises_asc) // 2
+        older_avg = surprises_asc[:mid].mean()
+        recent_avg = surprises_asc[mid:].mean()
         
-        diff = recent_avg - older_avg
+        diff = float(recent_avg - older_avg)
         
         # Use a threshold to determine significance
         if diff > 2.0:
@@ -132,123 +167,142 @@ class TickerSurprisesAnalyzer:
         else:
             return "stable"
     
-    def analyze_ticker(self, ticker, quarters_data):
+    def analyze_ticker(self, ticker, quarters, sector=None):
         """
         Comprehensive analysis of a single ticker's earnings surprises.
         
+        Args:
+            ticker: Ticker symbol
+            quarters: The ticker's quarters as column arrays keyed by raw field name
+                      (EarningsTable.ticker_columns)
+            sector: The ticker's sector, if already looked up (see ticker_sectors)
+        
         Returns:
             Dictionary with all calculated metrics
         """
-        if not quarters_data:
+        period = quarters['period']
+        if not period.size:
             return None
         
-        # Extract surprise percentages
-        surprises = [q.get('surprisePercent') for q in quarters_data if q.get('surprisePercent') is not None]
+        # Sort once, most recent first (equal periods keep file order, like a stable
+        # reverse sort); every metric and the quarterly details read this order
+        order = period.size - 1 - np.argsort(period[::-1], kind='stable')[::-1]
+        columns = {name: values[order] for name, values in quarters.items()}
+        surprises_desc = columns['surprisePercent']
         
-        if not surprises:
+        # Surprise percentages (missing dropped); every reduction below runs on this array
+        has_surprise = ~np.isnan(surprises_desc)
+        surprises = surprises_desc[has_surprise]
+        
+        if not surprises.size:
             return None
         
-        # Calculate basic statistics
-        avg_surprise = mean(surprises)
+        # Calculate basic statistics (mean and consistency in one pass)
+        avg_surprise, consistency_score = mean_std(surprises)
+        avg_surprise = float(avg_surprise)
+        consistency_score = float(consistency_score) if surprises.size > 1 else 0
         
         # Calculate beat rate
-        beats = sum(1 for s in surprises if s > self.thresholds['beat_threshold'])
-        beat_rate = (beats / len(surprises)) * 100
-        
-        # Calculate consistency (lower stdev = more consistent)
-        consistency_score = stdev(surprises) if len(surprises) > 1 else 0
-        
-        # Get beat streak
-        beat_streak = self.calculate_beat_streak(quarters_data)
-        
-        # Get trend direction
-        trend = self.calculate_trend_direction(quarters_data)
-        
-        # Get most recent quarter info
-        most_recent = max(quarters_data, key=lambda x: x.get('period', ''))
-        
-        # Count categories
-        categories = [self.classify_surprise(s) for s in surprises]
-        category_counts = {
-            'strong_beat': categories.count('strong_beat'),
-            'beat': categories.count('beat'),
-            'meet': categories.count('meet'),
-            'miss': categories.count('miss'),
-            'strong_miss': categories.count('strong_miss')
-        }
+        beats = int(np.count_nonzero(surprises > self.thresholds['beat_threshold']))
+        beat_rate = (beats / surprises.size) * 100
+        
+        # Get beat streak (missing surprises end the streak)
+        streak = self.calculate_beat_streak(surprises_desc)
+        
+        # Get trend direction (oldest first, missing surprises dropped). A stable ascending
+        # sort keeps equal periods in file order, which reversing the descending order wouldn't
+        surprises_asc = quarters['surprisePercent'][np.argsort(period, kind='stable')]
+        trend = self.calculate_trend_direction(surprises_asc[~np.isnan(surprises_asc)])
+        
+        # Classify every quarter once: the codes feed the category counts (one bincount,
+        # strong_beat first) and the per-quarter labels (code -1 = missing -> "unknown")
+        codes = classify_codes(surprises, self._category_bounds)
+        counts = np.bincount(codes, minlength=len(CATEGORY_NAMES)).tolist()
+        category_counts = dict(zip(CATEGORY_NAMES[::-1], counts[::-1]))
+        
+        quarter_codes = np.full(surprises_desc.size, -1, dtype=np.intp)
+        quarter_codes[has_surprise] = codes
+        categories = [CATEGORY_LABELS[code] for code in quarter_codes.tolist()]
+        
+        # Per-quarter records for the JSON output, zipped straight from the sorted columns
+        detail_columns = [column_to_list(name, columns[name], columns[INT_MASK])
+                          for name in QUARTER_DETAIL_COLUMNS]
+        quarterly_details = [dict(zip(QUARTER_DETAIL_KEYS, row))
+                             for row in zip(*detail_columns, categories)]
+        most_recent = quarterly_details[0]
         
         return {
             'ticker': ticker,
-            'sector': TICKER_TO_SECTOR.get(ticker, 'Unknown'),
-            'quarters_analyzed': len(quarters_data),
+            'sector': sector if sector is not None else TICKER_TO_SECTOR.get(ticker, 'Unknown'),
+            'quarters_analyzed': period.size,
             'average_surprise_percent': round(avg_surprise, 2),
             'beat_rate': round(beat_rate, 1),
-            'beat_streak': beat_streak,
+            'beat_streak': streak,
             'trend_direction': trend,
             'consistency_score': round(consistency_score, 2),
             'most_recent_quarter': {
-                'period': most_recent.get('period'),
-                'quarter': most_recent.get('quarter'),
-                'year': most_recent.get('year'),
-                'surprise_percent': most_recent.get('surprisePercent'),
-                'category': self.classify_surprise(most_recent.get('surprisePercent'))
+                'period': most_recent['period'],
+                'quarter': most_recent['quarter'],
+                'year': most_recent['year'],
+                'surprise_percent': most_recent['surprise_percent'],
+                'category': most_recent['category']
             },
             'category_breakdown': category_counts,
-            'quarterly_details': [
-                {
-                    'period': q.get('period'),
-                    'quarter': q.get('quarter'),
-                    'year': q.get('year'),
-                    'actual': q.get('actual'),
-                    'estimate': q.get('estimate'),
-                    'surprise': q.get('surprise'),
-                    'surprise_percent': q.get('surprisePercent'),
-                    'category': self.classify_surprise(q.get('surprisePercent'))
-                }
-                for q in sorted(quarters_data, key=lambda x: x.get('period', ''), reverse=True)
-            ]
+            'quarterly_details': quarterly_details
         }
     
-    def get_top_and_bottom_movers(self, ticker_analyses, n=25):
+    def get_top_and_bottom_movers(self, ticker_analyses, n=25, avg_surprises=None):
         """
         Get top N and bottom N tickers by average surprise percent.
         
         Args:
             ticker_analyses: List of ticker analysis dictionaries
             n: Number of top/bottom to return
+            avg_surprises: Optional float64 array of their average_surprise_percent
+                           (built here when not given)
             
         Returns:
             Tuple of (top_movers, bottom_movers)
         """
-        # Sort by average surprise percent
-        sorted_tickers = sorted(ticker_analyses, key=lambda x: x['average_surprise_percent'], reverse=True)
+        if avg_surprises is None:
+            avg_surprises = average_surprises(ticker_analyses)
+        
+        top_movers = [ticker_analyses[i] for i in top_n_indices(avg_surprises, n)]
         
-        top_movers = sorted_tickers[:n]
-        bottom_movers = sorted_tickers[-n:][::-1]  # Reverse to show worst first
+        # Worst first; among equal averages the later ticker comes first, as when
+        # reversing the tail of a stable descending sort
+        last = len(ticker_analyses) - 1
+        bottom_movers = [ticker_analyses[last - i] for i in top_n_indices(-avg_surprises[::-1], n)]
         
         return top_movers, bottom_movers
     
-    def calculate_summary_stats(self, ticker_analyses):
+    def calculate_summary_stats(self, ticker_analyses, avg_surprises=None):
         """Calculate overall summary statistics."""
-        avg_surprises = [t['average_surprise_percent'] for t in ticker_analyses]
-        beat_rates = [t['beat_rate'] for t in ticker_analyses]
+        if avg_surprises is None:
+            avg_surprises = average_surprises(ticker_analyses)
+        beat_rates = np.fromiter((t['beat_rate'] for t in ticker_analyses), dtype=np.float64,
+                                 count=len(ticker_analyses))
         
         # Count trend directions
         trends = [t['trend_direction'] for t in ticker_analyses]
         
+        # Upper median (element n//2 in sorted order), selected without a full sort
+        mid = len(avg_surprises) // 2
+        median_surprise = float(np.partition(avg_surprises, mid)[mid])
+        
         return {
             'total_tickers_analyzed': len(ticker_analyses),
-            'overall_average_surprise': round(mean(avg_surprises), 2),
-            'median_surprise': round(sorted(avg_surprises)[len(avg_surprises)//2], 2),
-            'overall_beat_rate': round(mean(beat_rates), 1),
+            'overall_average_surprise': round(float(avg_surprises.mean()), 2),
+            'median_surprise': round(median_surprise, 2),
+            'overall_beat_rate': round(float(beat_rates.mean()), 1),
             'trend_breakdown': {
                 'improving': trends.count('improving'),
                 'declining': trends.count('declining'),
                 'stable': trends.count('stable'),
                 'insufficient_data': trends.count('insufficient_data')
             },
-            'best_performer': max(avg_surprises),
-            'worst_performer': min(avg_surprises)
+            'best_performer': float(avg_surprises.max()),
+            'worst_performer': float(avg_surprises.min())
         }
     
     def save_to_json(self, top_movers, bottom_movers, summary_stats, output_file):
@@ -325,8 +379,7 @@ class TickerSurprisesAnalyzer:
             "top_25_worst_performers": bottom_movers
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(output, f, indent=2)
+        write_json(output, output_file, indent=self.config['output'].get('json_indent', 2))
         
         file_size = Path(output_file).stat().st_size
         print(f"\n✓ Ticker analysis saved to {output_file}")
@@ -349,20 +402,23 @@ def main():
     
     # Analyze each ticker
     print("\nAnalyzing individual tickers...")
-    ticker_analyses = []
-    for ticker, quarters_data in earnings_data.items():
-        analysis = analyzer.analyze_ticker(ticker, quarters_data)
-        if analysis:
-            ticker_analyses.append(analysis)
+    tickers = earnings_data.tickers.tolist()
+    sectors = ticker_sectors(tickers)
+    quarters = [earnings_data.ticker_columns(ticker) for ticker in tickers]
+    
+    analyses = list(map(analyzer.analyze_ticker, tickers, quarters, sectors))
+    ticker_analyses = [analysis for analysis in analyses if analysis]
     
     print(f"✓ Analyzed {len(ticker_analyses)} tickers")
     
     # Get top and bottom movers
     print(f"\nIdentifying top {analyzer.top_n} and bottom {analyzer.top_n} performers...")
-    top_movers, bottom_movers = analyzer.get_top_and_bottom_movers(ticker_analyses, analyzer.top_n)
+    avg_surprises = average_surprises(ticker_analyses)
+    top_movers, bottom_movers = analyzer.get_top_and_bottom_movers(ticker_analyses, analyzer.top_n,
+                                                                   avg_surprises)
     
     # Calculate summary statistics
-    summary_stats = analyzer.calculate_summary_stats(ticker_analyses)
+    summary_stats = analyzer.calculate_summary_stats(ticker_analyses, avg_surprises)
     
     # Save to JSON
     output_file = analyzer.config['output']['ticker_analysis']
@@ -22,16 +22,27 @@ Output: earnings_surprises.json with last 4 quarters for each S&P 500 ticker
 """
 
 import requests
-import yaml
+from requests.adapters import HTTPAdapter
 import json
 import time
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.spx_universe import get_spx_tickers
+from shared.config_io import load_yaml_config
+from shared.json_io import write_json
+
+# Try to import requests-cache for the on-disk HTTP cache
+try:
+    import requests_cache
+    HAS_REQUESTS_CACHE = True
+except ImportError:
+    HAS_REQUESTS_CACHE = False
 
 
 class EarningsSurprisesFetcher:
@@ -40,8 +51,8 @@ class EarningsSurprisesFetcher:
     def __init__(self, config_path="config.yml"):
         """Initialize fetcher with configuration."""
         import os
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Parsed once per process (libyaml loader when available)
+        self.config = load_yaml_config(config_path)
         
         # Get API key from environment variable first, fallback to config
         self.api_key = os.getenv('FINNHUB_API_KEY')
@@ -55,11 +66,34 @@ class EarningsSurprisesFetcher:
         
         # Rate limiting configuration
         self.calls_per_minute = self.config['rate_limiting']['calls_per_minute']
-        self.delay = self.config['rate_limiting']['delay_between_calls']
         self.window_size = self.config['rate_limiting']['window_size']
+        self.max_workers = self.config['rate_limiting'].get('max_workers', 8)
         
-        # Track API calls for rate limiting
+        # Sliding window for rate limiting, shared by all worker threads
         self.call_times = deque(maxlen=self.calls_per_minute)
+        self._rate_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        
+        # Pooled session reused across worker threads (one TCP/TLS handshake per connection).
+        # With requests-cache installed and http_cache.enabled set, responses are kept in a
+        # local SQLite cache so re-runs only hit the API for tickers whose cached response
+        # has expired (an expired response is still served if the refetch fails).
+        cache_config = self.config.get('http_cache', {})
+        self.use_cache = HAS_REQUESTS_CACHE and cache_config.get('enabled', False)
+        if self.use_cache:
+            self.session = requests_cache.CachedSession(
+                cache_config.get('cache_name', 'finnhub_cache'),
+                backend='sqlite',
+                expire_after=timedelta(hours=cache_config.get('expire_after_hours', 6)),
+                stale_if_error=True,
+                ignored_parameters=['token'],  # keep the API key out of the cache
+            )
+        else:
+            self.session = requests.Session()
+        # All requests go to one host, so a single pool sized to the worker count keeps
+        # every worker on a warm keep-alive connection (none are opened and discarded)
+        self.session.mount('https://', HTTPAdapter(pool_connections=1,
+                                                   pool_maxsize=self.max_workers))
         
         # Stats tracking
         self.stats = {
@@ -67,31 +101,37 @@ class EarningsSurprisesFetcher:
             'successful': 0,
             'failed': 0,
             'no_data': 0,
-            'api_calls': 0
+            'api_calls': 0,
+            'cache_hits': 0
         }
     
     def _rate_limit(self):
-        """Enforce rate limiting using sliding window."""
-        now = time.time()
-        
-        # Remove calls outside the current window
-        while self.call_times and self.call_times[0] < now - self.window_size:
-            self.call_times.popleft()
-        
-        # If we've hit the limit, wait
-        if len(self.call_times) >= self.calls_per_minute:
-            sleep_time = self.window_size - (now - self.call_times[0]) + 0.1
-            if sleep_time > 0:
-                print(f"Rate limit reached. Waiting {sleep_time:.1f}s...")
-                time.sleep(sleep_time)
-                now = time.time()
-        
-        # Add fixed delay between calls
-        time.sleep(self.delay)
-        
-        # Record this call
-        self.call_times.append(now)
-        self.stats['api_calls'] += 1
+        """Enforce rate limiting using sliding window (thread-safe)."""
+        with self._rate_lock:
+            now = time.time()
+            
+            # Remove calls outside the current window
+            while self.call_times and self.call_times[0] < now - self.window_size:
+                self.call_times.popleft()
+            
+            # If we've hit the limit, wait until the oldest call leaves the window
+            # (holding the lock so other workers queue behind us)
+            if len(self.call_times) >= self.calls_per_minute:
+                sleep_time = self.window_size - (now - self.call_times[0]) + 0.1
+                if sleep_time > 0:
+                    print(f"Rate limit reached. Waiting {sleep_time:.1f}s...")
+                    time.sleep(sleep_time)
+                    now = time.time()
+                self.call_times.popleft()
+            
+            # Record this call
+            self.call_times.append(now)
+        self._record('api_calls')
+    
+    def _record(self, key):
+        """Increment a statistics counter (thread-safe)."""
+        with self._stats_lock:
+            self.stats[key] += 1
     
     def fetch_ticker_earnings(self, symbol):
         """
@@ -101,10 +141,9 @@ class EarningsSurprisesFetcher:
             symbol: Stock ticker symbol
             
         Returns:
-            List of earnings data (up to 4 quarters), or None if error/no data
+            List of earnings data (up to 4 quarters), [] if no data, or None on error
+            (progress is printed by the caller; only errors are printed here)
         """
-        self._rate_limit()
-        
         url = f"{self.base_url}{self.endpoint}"
         params = {
             'symbol': symbol,
@@ -113,16 +152,28 @@ class EarningsSurprisesFetcher:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            # Cached responses are served locally and don't count against the rate limit
+            response = None
+            if self.use_cache:
+                response = self.session.get(url, params=params, only_if_cached=True)
+                # stale_if_error lets the probe return an expired entry instead of a 504,
+                # so expired entries count as misses here and are refetched below
+                if response.status_code == 504 or getattr(response, 'is_expired', False):
+                    response = None
+                else:
+                    self._record('cache_hits')
+            
+            if response is None:
+                self._rate_limit()
+                response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
             
             # API returns empty list if no data available
             if not data or len(data) == 0:
-                print(f"  ⚠ {symbol}: No earnings data available")
-                self.stats['no_data'] += 1
-                return None
+                self._record('no_data')
+                return []
             
             # Validate data structure
             for quarter_data in data:
@@ -130,17 +181,16 @@ class EarningsSurprisesFetcher:
                     print(f"  ⚠ {symbol}: Incomplete data structure")
                     return None
             
-            print(f"  ✓ {symbol}: {len(data)} quarters retrieved")
-            self.stats['successful'] += 1
+            self._record('successful')
             return data
             
         except requests.exceptions.RequestException as e:
             print(f"  ✗ {symbol}: API error - {str(e)}")
-            self.stats['failed'] += 1
+            self._record('failed')
             return None
         except json.JSONDecodeError:
             print(f"  ✗ {symbol}: Invalid JSON response")
-            self.stats['failed'] += 1
+            self._record('failed')
             return None
     
     def fetch_all_earnings(self):
@@ -164,18 +214,26 @@ class EarningsSurprisesFetcher:
         print(f"\nFetching earnings data for {len(tickers)} S&P 500 companies")
         print(f"Rate limit: {self.calls_per_minute} calls/minute")
         print(f"Quarters per ticker: {self.quarters_limit}")
-        print(f"Estimated time: ~{(len(tickers) * self.delay / 60):.1f} minutes\n")
-        
-        earnings_data = {}
+        print(f"Estimated time: ~{(len(tickers) / self.calls_per_minute):.1f} minutes\n")
         
-        for i, ticker in enumerate(tickers, 1):
-            print(f"[{i}/{len(tickers)}] {ticker}")
+        # Workers overlap network latency behind the shared rate gate
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_ticker_earnings, ticker): ticker for ticker in tickers}
             
-            data = self.fetch_ticker_earnings(ticker)
-            if data is not None:
-                earnings_data[ticker] = data
+            # One progress line per ticker, written from this thread only
+            for i, future in enumerate(as_completed(futures), 1):
+                ticker = futures[future]
+                data = results[ticker] = future.result()
+                
+                if data:
+                    print(f"[{i}/{len(tickers)}] ✓ {ticker}: {len(data)} quarters retrieved")
+                elif data is not None:
+                    print(f"[{i}/{len(tickers)}] ⚠ {ticker}: No earnings data available")
+                # Error message already printed in fetch_ticker_earnings
         
-        return earnings_data
+        # Keep the universe's ticker order in the output
+        return {ticker: results[ticker] for ticker in tickers if results[ticker]}
     
     def save_to_json(self, data, output_file):
         """Save earnings data to JSON file with metadata."""
@@ -204,8 +262,7 @@ class EarningsSurprisesFetcher:
             "data": data
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        write_json(output, output_path, indent=self.config['output'].get('json_indent', 2))
         
         # Get file size
         file_size = output_path.stat().st_size
@@ -224,6 +281,7 @@ class EarningsSurprisesFetcher:
         print(f"No data: {self.stats['no_data']}")
         print(f"Failed: {self.stats['failed']}")
         print(f"API calls made: {self.stats['api_calls']}")
+        print(f"Cache hits: {self.stats['cache_hits']}")
         print("=" * 70)
 
 
@@ -5,10 +5,13 @@ Includes: Housing activity, prices, mortgage rates, debt service, and inflation
 """
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+import pandas as pd
+
 # Add shared to path for imports
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
@@ -16,25 +19,119 @@ SHARED_DIR = REPO_ROOT / "shared"
 if str(SHARED_DIR) not in sys.path:
     sys.path.insert(0, str(SHARED_DIR))
 
-from fred_client import FREDClient
+from fred_client import FREDClient, DEFAULT_CACHE_DIR
 from economy_indicators import get_indicators_by_category
 from economy_compute import (
-    calculate_percentile_rank,
     calculate_grade,
     calculate_overall_grade,
     calculate_trend,
     is_trend_favorable,
     calculate_change_metrics,
     adaptive_resample,
+    encode_history_dates,
     sanitize_for_json,
 )
 from economy_io import load_config, save_json
 
 
-def export_housing_affordability_json(output_path: str, config_path: str = None, override_history_days: int = None) -> dict:
-    """Generate Housing & Affordability indicators JSON."""
+# Output README (static), built once at import
+_README = {
+    "title": "Housing & Affordability Dashboard",
+    "description": "Housing activity, home prices, financing costs, and household affordability metrics from FRED.",
+    "purpose": "Summarize housing supply/demand health and borrower cost pressure for macro monitoring and market commentary.",
+    "metrics_explained": {
+        "HOUST": {
+            "description": "New privately-owned housing units started (construction pipeline).",
+            "interpretation": "Higher starts signal growing supply; sustained drops can flag builder pullback."
+        },
+        "PERMIT": {
+            "description": "Housing units authorized by permits (leading indicator for future starts).",
+            "interpretation": "Permits tend to turn before starts; falling permits often precede slower construction."
+        },
+        "HSN1F": {
+            "description": "New single-family houses sold (demand for new construction).",
+            "interpretation": "Rising sales point to healthy builder demand; sharp drops can warn of demand softening."
+        },
+        "EXHOSLUSM495S": {
+            "description": "Existing single-family home sales (resale market volume).",
+            "interpretation": "Higher turnover suggests active resale demand; low volumes can reflect tight inventory or weak demand."
+        },
+        "CSUSHPINSA": {
+            "description": "S&P/Case-Shiller U.S. National Home Price Index (broad home price level).",
+            "interpretation": "Higher is not always better; fast price gains can worsen affordability while broad declines can signal stress."
+        },
+        "MORTGAGE30US": {
+            "description": "Average 30-year fixed mortgage rate (weekly).",
+            "interpretation": "Lower rates improve monthly payments and refinance ability; rapid increases pressure affordability."
+        },
+        "MORTGAGE15US": {
+            "description": "Average 15-year fixed mortgage rate (weekly).",
+            "interpretation": "Tracks shorter-term mortgage pricing; helpful for refinance affordability comparisons."
+        },
+        "TDSP": {
+            "description": "Household debt service payments as a percent of disposable personal income.",
+            "interpretation": "Lower ratios indicate more cushion for debt service; rising ratios tighten household cash flow."
+        },
+        "MDSP": {
+            "description": "Mortgage debt service payments as a percent of disposable personal income.",
+            "interpretation": "Direct affordability gauge for mortgage payments; rising values reduce affordability."
+        },
+        "T10YIE": {
+            "description": "10-year breakeven inflation rate (market-based inflation expectations).",
+            "interpretation": "Higher expectations can pressure mortgage rates and real affordability over time."
+        }
+    },
+    "trading_applications": {
+        "homebuilders": "Pair starts/permits/sales trends with mortgage rates to assess homebuilder earnings sensitivity.",
+        "macro_risk": "Use debt service ratios and breakeven inflation as affordability stress markers in macro risk dashboards."
+    },
+    "notes": {
+        "history_window": "20-year history (7300 days) for percentile grading.",
+        "grading": "Percentile grades use indicator interpretation (higher vs lower is better).",
+        "resampling": "Series are adaptively resampled to a storage-friendly cadence per frequency before history is saved.",
+        "history_dates": "Evenly spaced series store date_range {start, freq, n} (rebuild with pd.date_range); irregular series store epoch_days (days since 1970-01-01)."
+    }
+}
+
+# Overall-grade summaries for get_summary_description
+_SUMMARY_DESCRIPTIONS = {
+    "A+": "Housing activity, prices, and affordability metrics are exceptionally favorable.",
+    "A": "Housing indicators are very healthy with supportive affordability conditions.",
+    "B": "Housing indicators are generally supportive though affordability should be monitored.",
+    "C": "Housing indicators are mixed with emerging affordability or activity concerns.",
+    "D": "Housing indicators signal stress in activity, affordability, or financing costs.",
+    "N/A": "Insufficient data to assess housing and affordability conditions.",
+}
+
+
+def postprocess_series(df_clean: pd.DataFrame, frequency: str, series_id: str) -> tuple:
+    """
+    Change metrics and resampled history for one series.
+
+    Returns:
+        (changes, history_entry), history_entry is None when nothing is left to store
+    """
+    changes = calculate_change_metrics(df_clean, frequency=frequency)
+    df_resampled = adaptive_resample(df_clean, frequency, series_id)
+    if df_resampled.empty:
+        return changes, None
+    history_entry = {
+        **encode_history_dates(df_resampled["date"]),
+        "values": df_resampled["value"].to_numpy().tolist(),
+    }
+    return changes, history_entry
+
+
+def export_housing_affordability_json(output_path: str, config_path: str = None, override_history_days: int = None,
+                                      verbose: bool = True) -> dict:
+    """Generate Housing & Affordability indicators JSON (verbose=False prints only warnings)."""
     config = load_config(config_path)
-    fred = FREDClient(rate_limit=config.get("fred", {}).get("rate_limit_seconds", 0.1))
+    fred_config = config.get("fred", {})
+    fred = FREDClient(
+        rate_limit=fred_config.get("rate_limit_seconds", 0.1),
+        cache_dir=Path(fred_config.get("cache_dir", DEFAULT_CACHE_DIR)).expanduser(),
+        cache_ttl=fred_config.get("cache_ttl_hours", 0) * 3600,
+    )
     indicators = get_indicators_by_category("housing_affordability")
 
     if override_history_days:
@@ -47,83 +144,36 @@ def export_housing_affordability_json(output_path: str, config_path: str = None,
     start_date_str = start_date.strftime("%Y-%m-%d")
     end_date_str = end_date.strftime("%Y-%m-%d")
 
-    print(f"Fetching Housing & Affordability data from {start_date_str} to {end_date_str}...")
-    print("  (20-year lookback for robust percentile calculations)")
+    if verbose:
+        print(f"Fetching Housing & Affordability data from {start_date_str} to {end_date_str}...")
+        print("  (20-year lookback for robust percentile calculations)")
 
-    indicator_data = {}
-    for indicator in indicators:
-        if indicator.is_derived:
-            continue
-        print(f"  Fetching {indicator.series_id} ({indicator.name})...")
-        try:
-            df = fred.get_series_range(indicator.series_id, start_date_str, end_date_str)
-            indicator_data[indicator.series_id] = df
-        except Exception as fetch_error:
-            print(f"  Warning: Failed to fetch {indicator.series_id}: {fetch_error}")
-            indicator_data[indicator.series_id] = None
+    # Derived indicators have no FRED series of their own; filtered once for both loops below.
+    # Series are fetched concurrently; FREDClient spaces request starts by its rate limit
+    active_indicators = [indicator for indicator in indicators if not indicator.is_derived]
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(active_indicators)))) as executor:
+        futures = {}
+        for indicator in active_indicators:
+            if verbose:
+                print(f"  Fetching {indicator.series_id} ({indicator.name})...")
+            futures[executor.submit(fred.get_series_range, indicator.series_id, start_date_str, end_date_str)] = indicator
+        for future in as_completed(futures):
+            series_id = futures[future].series_id
+            try:
+                fetched[series_id] = future.result()
+            except Exception as fetch_error:
+                print(f"  Warning: Failed to fetch {series_id}: {fetch_error}")
+                fetched[series_id] = None
+
+    # Keep indicator order regardless of completion order
+    indicator_data = {indicator.series_id: fetched[indicator.series_id] for indicator in active_indicators}
 
     eastern = ZoneInfo("America/New_York")
     now = datetime.now(eastern)
 
-    readme = {
-        "title": "Housing & Affordability Dashboard",
-        "description": "Housing activity, home prices, financing costs, and household affordability metrics from FRED.",
-        "purpose": "Summarize housing supply/demand health and borrower cost pressure for macro monitoring and market commentary.",
-        "metrics_explained": {
-            "HOUST": {
-                "description": "New privately-owned housing units started (construction pipeline).",
-                "interpretation": "Higher starts signal growing supply; sustained drops can flag builder pullback."
-            },
-            "PERMIT": {
-                "description": "Housing units authorized by permits (leading indicator for future starts).",
-                "interpretation": "Permits tend to turn before starts; falling permits often precede slower construction."
-            },
-            "HSN1F": {
-                "description": "New single-family houses sold (demand for new construction).",
-                "interpretation": "Rising sales point to healthy builder demand; sharp drops can warn of demand softening."
-            },
-            "EXHOSLUSM495S": {
-                "description": "Existing single-family home sales (resale market volume).",
-                "interpretation": "Higher turnover suggests active resale demand; low volumes can reflect tight inventory or weak demand."
-            },
-            "CSUSHPINSA": {
-                "description": "S&P/Case-Shiller U.S. National Home Price Index (broad home price level).",
-                "interpretation": "Higher is not always better; fast price gains can worsen affordability while broad declines can signal stress."
-            },
-            "MORTGAGE30US": {
-                "description": "Average 30-year fixed mortgage rate (weekly).",
-                "interpretation": "Lower rates improve monthly payments and refinance ability; rapid increases pressure affordability."
-            },
-            "MORTGAGE15US": {
-                "description": "Average 15-year fixed mortgage rate (weekly).",
-                "interpretation": "Tracks shorter-term mortgage pricing; helpful for refinance affordability comparisons."
-            },
-            "TDSP": {
-                "description": "Household debt service payments as a percent of disposable personal income.",
-                "interpretation": "Lower ratios indicate more cushion for debt service; rising ratios tighten household cash flow."
-            },
-            "MDSP": {
-                "description": "Mortgage debt service payments as a percent of disposable personal income.",
-                "interpretation": "Direct affordability gauge for mortgage payments; rising values reduce affordability."
-            },
-            "T10YIE": {
-                "description": "10-year breakeven inflation rate (market-based inflation expectations).",
-                "interpretation": "Higher expectations can pressure mortgage rates and real affordability over time."
-            }
-        },
-        "trading_applications": {
-            "homebuilders": "Pair starts/permits/sales trends with mortgage rates to assess homebuilder earnings sensitivity.",
-            "macro_risk": "Use debt service ratios and breakeven inflation as affordability stress markers in macro risk dashboards."
-        },
-        "notes": {
-            "history_window": "20-year history (7300 days) for percentile grading.",
-            "grading": "Percentile grades use indicator interpretation (higher vs lower is better).",
-            "resampling": "Series are adaptively resampled to a storage-friendly cadence per frequency before history is saved."
-        }
-    }
-
     json_data = {
-        "_README": readme,
+        "_README": _README,
         "metadata": {
             "generated_at": now.isoformat(),
             "data_source": "FRED API",
@@ -145,31 +195,60 @@ def export_housing_affordability_json(output_path: str, config_path: str = None,
         "history": {"series": {}},
     }
 
+    # All fetched series in one long frame (series_id column), so the per-series
+    # latest/previous values and percentile ranks come from grouped C-level reductions
+    # instead of per-indicator pandas indexing and scans. series_id is categorical
+    # (int8 codes rather than repeated strings), so grouping works on small ints
+    frames = [
+        df.assign(series_id=series_id)
+        for series_id, df in indicator_data.items()
+        if df is not None and not df.empty
+    ]
+    history = (
+        pd.concat(frames, ignore_index=True).dropna(subset=["value"])
+        if frames else pd.DataFrame(columns=["date", "value", "series_id"])
+    )
+    history["series_id"] = pd.Categorical(history["series_id"], categories=list(indicator_data))
+    by_series = history.groupby("series_id", sort=False, observed=True)
+    latest = by_series.agg(current_value=("value", "last"), current_date=("date", "last"), count=("value", "size"))
+    previous = history.loc[by_series["value"].nth(-2).index].set_index("series_id")["value"]
+    # Percentile rank = share of history strictly below the current value
+    below = (history["value"] < by_series["value"].transform("last")).groupby(history["series_id"], sort=False, observed=True).sum()
+    series_frames = {series_id: frame[["date", "value"]] for series_id, frame in by_series}
+    # Plain dicts of the per-series scalars, so the loop below does no pandas indexing
+    current_values = latest["current_value"].to_dict()
+    current_dates = latest["current_date"].to_dict()
+    percentiles = (below / latest["count"] * 100.0).to_dict()
+
     grades = []
 
-    for indicator in indicators:
+    ready_indicators = []
+    for indicator in active_indicators:
         series_id = indicator.series_id
-        if series_id not in indicator_data or indicator_data[series_id] is None or indicator_data[series_id].empty:
+        if indicator_data[series_id] is None or indicator_data[series_id].empty:
             print(f"  Warning: No data for {series_id}")
             continue
+        if series_id in series_frames:
+            ready_indicators.append(indicator)
 
-        df = indicator_data[series_id]
-        df_clean = df.dropna(subset=["value"])
-        if df_clean.empty:
-            continue
+    # Change metrics and resampling, one series at a time
+    postprocessed = [
+        postprocess_series(series_frames[indicator.series_id], indicator.frequency, indicator.series_id)
+        for indicator in ready_indicators
+    ]
 
-        current_value = df_clean.iloc[-1]["value"]
-        current_date = df_clean.iloc[-1]["date"]
-        previous_value = df_clean.iloc[-2]["value"] if len(df_clean) > 1 else current_value
+    for indicator, (changes, history_entry) in zip(ready_indicators, postprocessed):
+        series_id = indicator.series_id
+        current_value = current_values[series_id]
+        current_date = current_dates[series_id]
+        previous_value = previous.get(series_id, current_value)
 
-        historical_values = df_clean["value"]
-        percentile = calculate_percentile_rank(historical_values, current_value)
+        percentile = round(percentiles[series_id], 2)
         grade = calculate_grade(percentile, indicator.interpretation)
         grades.append(grade)
 
         trend = calculate_trend(current_value, previous_value)
         is_favorable = is_trend_favorable(trend, indicator.interpretation)
-        changes = calculate_change_metrics(df_clean, frequency=indicator.frequency)
 
         if json_data["current"]["date"] is None:
             json_data["current"]["date"] = current_date.strftime("%Y-%m-%d")
@@ -187,15 +266,12 @@ def export_housing_affordability_json(output_path: str, config_path: str = None,
             "interpretation": indicator.interpretation,
         }
 
-        print(f"  Resampling {series_id} ({indicator.frequency} → storage format)...")
-        df_resampled = adaptive_resample(df_clean, indicator.frequency, series_id)
-
-        if not df_resampled.empty:
-            json_data["history"]["series"][series_id] = {
-                "dates": [d.strftime("%Y-%m-%d") for d in df_resampled["date"]],
-                "values": df_resampled["value"].tolist(),
-            }
-            print(f"    → Stored {len(df_resampled)} data points")
+        if verbose:
+            print(f"  Resampling {series_id} ({indicator.frequency} → storage format)...")
+        if history_entry is not None:
+            json_data["history"]["series"][series_id] = history_entry
+            if verbose:
+                print(f"    → Stored {len(history_entry['values'])} data points")
 
     json_data["current"]["overall_grade"] = calculate_overall_grade(grades)
     json_data["current"]["summary"] = get_summary_description(json_data["current"]["overall_grade"].get("grade", "N/A"))
@@ -209,25 +285,18 @@ def export_housing_affordability_json(output_path: str, config_path: str = None,
 
 def get_summary_description(grade: str) -> str:
     """Get summary description based on overall grade."""
-    descriptions = {
-        "A+": "Housing activity, prices, and affordability metrics are exceptionally favorable.",
-        "A": "Housing indicators are very healthy with supportive affordability conditions.",
-        "B": "Housing indicators are generally supportive though affordability should be monitored.",
-        "C": "Housing indicators are mixed with emerging affordability or activity concerns.",
-        "D": "Housing indicators signal stress in activity, affordability, or financing costs.",
-        "N/A": "Insufficient data to assess housing and affordability conditions.",
-    }
-    return descriptions.get(grade, "Housing and affordability indicators are being monitored.")
+    return _SUMMARY_DESCRIPTIONS.get(grade, "Housing and affordability indicators are being monitored.")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Export Housing & Affordability indicators to JSON")
     parser.add_argument("--output", type=str, default="housing_affordability.json")
     parser.add_argument("--config", type=str, default=None)
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-series progress output")
     args = parser.parse_args()
 
     try:
-        export_housing_affordability_json(args.output, args.config)
+        export_housing_affordability_json(args.output, args.config, verbose=not args.quiet)
         print("\n✓ Housing & Affordability data export complete!")
     except Exception as e:
         print(f"\n✗ Error: {e}", file=sys.stderr)
@@ -1,7 +1,7 @@
 """
 Orchestrator to fetch all implied volatility data.
 
-Runs all IV fetchers in sequence:
+Runs all IV fetchers concurrently (one process each, output printed per fetcher):
 1. Sector ETFs (11 symbols)
 2. Major Indices (4 symbols)
 3. VIX Options (1 symbol)
@@ -15,13 +15,21 @@ Generates 6 JSON files total:
 - vix_options_historical.json
 """
 
+import os
 import sys
+import io
 import importlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import time
 
 
+# Section banner rule, built once
+_BAR80 = "=" * 80
+
+
 # List of fetcher modules to run
 FETCHERS = [
     {
@@ -42,12 +50,43 @@ FETCHERS = [
 ]
 
 
-def run_fetcher(fetcher_info: dict) -> dict:
+def _run_module(module_name: str) -> dict:
+    """
+    Import and run one fetcher module (in a worker process), capturing its output.
+    
+    Args:
+        module_name: Fetcher module to import and run
+    
+    Returns:
+        Dict with success status, duration, error (if any) and captured output
+    """
+    output = io.StringIO()
+    start_time = time.time()
+    error = None
+    
+    with contextlib.redirect_stdout(output):
+        try:
+            # Dynamically import and run the fetcher
+            module = importlib.import_module(module_name)
+            module.main()
+        except Exception as e:
+            error = str(e)
+    
+    return {
+        'success': error is None,
+        'duration': round(time.time() - start_time, 2),
+        'error': error,
+        'output': output.getvalue()
+    }
+
+
+def run_fetcher(fetcher_info: dict, run_result: dict) -> dict:
     """
-    Run a single fetcher module.
+    Print a finished fetcher's header and captured output.
     
     Args:
         fetcher_info: Dict with module, name, description
+        run_result: Result of _run_module for this fetcher
     
     Returns:
         Dict with success status, duration, error (if any)
@@ -55,45 +94,30 @@ def run_fetcher(fetcher_info: dict) -> dict:
     module_name = fetcher_info['module']
     display_name = fetcher_info['name']
     
-    print(f"\n{'='*80}")
+    print("\n" + _BAR80)
     print(f"Running: {display_name}")
     print(f"Module: {module_name}.py")
     print(f"Description: {fetcher_info['description']}")
-    print(f"{'='*80}\n")
+    print(_BAR80 + "\n")
     
-    start_time = time.time()
+    print(run_result['output'], end='')
     
-    try:
-        # Dynamically import and run the fetcher
-        module = importlib.import_module(module_name)
-        module.main()
-        
-        duration = time.time() - start_time
-        
-        return {
-            'success': True,
-            'duration': round(duration, 2),
-            'error': None
-        }
-        
-    except Exception as e:
-        duration = time.time() - start_time
-        
+    if not run_result['success']:
         print(f"\n❌ ERROR in {display_name}:")
-        print(f"   {str(e)}")
-        
-        return {
-            'success': False,
-            'duration': round(duration, 2),
-            'error': str(e)
-        }
+        print(f"   {run_result['error']}")
+    
+    return {
+        'success': run_result['success'],
+        'duration': run_result['duration'],
+        'error': run_result['error']
+    }
 
 
 def main():
     """Main orchestrator function."""
-    print("="*80)
+    print(_BAR80)
     print("IMPLIED VOLATILITY DATA ORCHESTRATOR")
-    print("="*80)
+    print(_BAR80)
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Fetchers to run: {len(FETCHERS)}")
     print()
@@ -101,32 +125,39 @@ def main():
     for i, fetcher in enumerate(FETCHERS, 1):
         print(f"{i}. {fetcher['name']} ({fetcher['description']})")
     
-    print("\n" + "="*80)
+    print("\n" + _BAR80)
     print("STARTING FETCH SEQUENCE")
-    print("="*80)
+    print(_BAR80)
     
     overall_start = time.time()
     results = []
     
-    # Run each fetcher
-    for fetcher in FETCHERS:
-        result = run_fetcher(fetcher)
-        results.append({
-            'name': fetcher['name'],
-            'module': fetcher['module'],
-            **result
-        })
-        
-        # Brief pause between fetchers to avoid rate limiting
-        if result['success']:
-            time.sleep(1)
+    # The fetchers share no state and write disjoint files, so run them side by side
+    # (wall time is the slowest fetcher, not the sum). Each one's output is printed
+    # as a block when it finishes, so logs from different fetchers don't interleave.
+    # No pause between fetchers: each process bounds and retries its own Yahoo
+    # requests (utils.yahoo_request), so throttling is handled where it happens
+    with ProcessPoolExecutor(max_workers=len(FETCHERS)) as executor:
+        futures = {executor.submit(_run_module, fetcher['module']): fetcher for fetcher in FETCHERS}
+        for future in as_completed(futures):
+            fetcher = futures[future]
+            result = run_fetcher(fetcher, future.result())
+            results.append({
+                'name': fetcher['name'],
+                'module': fetcher['module'],
+                **result
+            })
+    
+    # Summary in FETCHERS order regardless of completion order
+    order = {fetcher['module']: i for i, fetcher in enumerate(FETCHERS)}
+    results.sort(key=lambda r: order[r['module']])
     
     overall_duration = time.time() - overall_start
     
     # Summary report
-    print("\n\n" + "="*80)
+    print("\n\n" + _BAR80)
     print("FETCH SEQUENCE COMPLETE - SUMMARY")
-    print("="*80)
+    print(_BAR80)
     print(f"End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Total duration: {overall_duration:.2f} seconds")
     print()
@@ -149,20 +180,23 @@ def main():
             print(f"  ❌ {r['name']:30s} - {r['error']}")
     
     # List generated files
-    print("\n" + "="*80)
+    print("\n" + _BAR80)
     print("GENERATED FILES")
-    print("="*80)
+    print(_BAR80)
     
     output_dir = Path(__file__).parent
-    json_files = sorted(output_dir.glob('*.json'))
+    # One directory scan; DirEntry carries the file type, so no extra stat per name
+    # (skip test output if it exists)
+    with os.scandir(output_dir) as entries:
+        json_files = sorted(
+            (entry for entry in entries
+             if entry.name.endswith('.json') and 'test' not in entry.name.lower() and entry.is_file()),
+            key=lambda entry: entry.name
+        )
     
     if json_files:
         total_size = 0
         for json_file in json_files:
-            # Skip test output if exists
-            if 'test' in json_file.name.lower():
-                continue
-            
             size = json_file.stat().st_size
             total_size += size
             size_kb = size / 1024
@@ -174,14 +208,14 @@ def main():
         print("  No JSON files found")
     
     # Exit code
-    print("\n" + "="*80)
+    print("\n" + _BAR80)
     if failed:
         print("⚠️  COMPLETED WITH ERRORS")
-        print("="*80)
+        print(_BAR80)
         sys.exit(1)
     else:
         print("✅ ALL FETCHERS COMPLETED SUCCESSFULLY")
-        print("="*80)
+        print(_BAR80)
         sys.exit(0)
 
 
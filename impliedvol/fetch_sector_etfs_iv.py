@@ -9,32 +9,121 @@ Outputs:
 - sector_etfs_iv_historical.json: 252 days of IV data with moving averages
 """
 
-import json
-import yaml
+import os
+import sys
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.config_io import load_yaml_config
+from shared.json_io import dumps_json, write_json
+
 # Use Eastern Time for market data timestamps
 ET = ZoneInfo('America/New_York')
 
 from utils import (
+    make_session,
     get_option_snapshot,
     classify_iv_level,
     format_iv_percentage,
     serialize_for_json,
-    get_iv_historical_reference
+    get_iv_historical_reference,
+    build_historical_reference
 )
 
-# Load config
+# Load config (parsed once per process and shared by all fetcher modules)
 CONFIG_PATH = Path(__file__).parent / 'config.yml'
-with open(CONFIG_PATH, 'r') as f:
-    config = yaml.safe_load(f)
+config = load_yaml_config(CONFIG_PATH)
 
 SECTOR_ETFS = config['sector_etfs']
 OPTIONS_CRITERIA = config['options_criteria']
 OUTPUT_CONFIG = config['output']['sector_etfs']
+MAX_WORKERS = config.get('fetching', {}).get('max_workers', 8)
+
+SNAPSHOT_PATH = Path(__file__).parent / OUTPUT_CONFIG['snapshot']
+# Per-symbol checkpoint (JSONL): keeps the symbols fetched so far if a run dies mid-way
+PARTIAL_PATH = SNAPSHOT_PATH.with_suffix('.partial.jsonl')
+
+# One pooled HTTP session shared by every symbol fetch in this module
+SESSION = make_session()
+
+# Section banner rule, built once
+_BAR80 = "=" * 80
+
+
+# Output README (static), built once at import
+_README_STATIC = {
+    'description': 'Implied volatility snapshot for S&P 500 sector ETFs',
+    'data_source': 'yfinance (Yahoo Finance) - Options data',
+    'update_frequency': 'Real-time (run script to update)',
+    'last_updated': None,  # filled in per run
+    'num_symbols': None,
+    'symbols': None,
+    'options_criteria': {
+        'min_days_to_expiration': OPTIONS_CRITERIA['min_dte'],
+        'max_days_to_expiration': OPTIONS_CRITERIA['max_dte'],
+        'atm_tolerance': f"{OPTIONS_CRITERIA['atm_tolerance']*100}%"
+    },
+    'fields_explanation': {
+        'current_price': 'Current ETF price',
+        'expiration_date': 'Option expiration date used',
+        'days_to_expiration': 'Days until expiration',
+        'average_iv': 'Average of ATM call and put implied volatility',
+        'average_iv_formatted': 'IV as percentage (e.g., 25.50%)',
+        'iv_level': 'Classification: Low, Normal, Elevated, High, Extreme',
+        'atm_call': 'ATM call option details (strike, IV, prices, liquidity)',
+        'atm_put': 'ATM put option details (strike, IV, prices, liquidity)',
+        'moneyness': 'Strike / Underlying price',
+        'pct_from_atm': 'Percentage difference from ATM',
+        'volume': 'Option trading volume today',
+        'open_interest': 'Total open option contracts',
+        'bid_ask_spread': 'Difference between bid and ask',
+        'spread_pct': 'Bid-ask spread as % of mid price'
+    },
+    'interpretation': {
+        'low_iv': 'IV < 15% - Market expects low volatility, options are cheap',
+        'normal_iv': 'IV 15-25% - Typical market conditions',
+        'elevated_iv': 'IV 25-35% - Market expects higher volatility',
+        'high_iv': 'IV 35-50% - Significant uncertainty expected',
+        'extreme_iv': 'IV > 50% - Extreme volatility expected (rare)'
+    }
+}
+
+
+def _fetch_symbol(symbol, info):
+    """
+    Fetch one symbol's option snapshot and add sector metadata (runs in a worker thread).
+    
+    Returns:
+        Snapshot dict, or None if the fetch failed
+    """
+    snapshot = get_option_snapshot(
+        symbol,
+        min_dte=OPTIONS_CRITERIA['min_dte'],
+        max_dte=OPTIONS_CRITERIA['max_dte'],
+        atm_tolerance=OPTIONS_CRITERIA['atm_tolerance'],
+        session=SESSION
+    )
+    
+    if snapshot:
+        # Add sector metadata
+        snapshot['sector'] = info['sector']
+        snapshot['name'] = info['name']
+        snapshot['description'] = info['description']
+        
+        # Format IV percentages for display
+        snapshot['average_iv_formatted'] = format_iv_percentage(snapshot['average_iv'])
+        snapshot['iv_level'] = classify_iv_level(snapshot['average_iv'])
+        
+        # Add historical reference data
+        hist_ref = get_iv_historical_reference(symbol)
+        snapshot['historical_reference'] = asdict(build_historical_reference(snapshot['average_iv'], hist_ref))
+    
+    return snapshot
 
 
 def fetch_sector_etfs_snapshot():
@@ -44,9 +133,9 @@ def fetch_sector_etfs_snapshot():
     Returns:
         Dict with metadata and sector ETF IV data
     """
-    print("="*80)
+    print(_BAR80)
     print("FETCHING SECTOR ETFs IMPLIED VOLATILITY SNAPSHOT")
-    print("="*80)
+    print(_BAR80)
     print(f"Symbols: {', '.join(SECTOR_ETFS.keys())}")
     print(f"Timestamp: {datetime.now(ET).strftime('%Y-%m-%d %H:%M:%S %Z')}")
     print()
@@ -54,44 +143,28 @@ def fetch_sector_etfs_snapshot():
     results = {}
     success_count = 0
     
-    for symbol, info in SECTOR_ETFS.items():
-        print(f"Fetching {symbol} ({info['sector']})...", end=' ')
-        
-        snapshot = get_option_snapshot(
-            symbol,
-            min_dte=OPTIONS_CRITERIA['min_dte'],
-            max_dte=OPTIONS_CRITERIA['max_dte'],
-            atm_tolerance=OPTIONS_CRITERIA['atm_tolerance']
-        )
-        
-        if snapshot:
-            # Add sector metadata
-            snapshot['sector'] = info['sector']
-            snapshot['name'] = info['name']
-            snapshot['description'] = info['description']
-            
-            # Format IV percentages for display
-            snapshot['average_iv_formatted'] = format_iv_percentage(snapshot['average_iv'])
-            snapshot['iv_level'] = classify_iv_level(snapshot['average_iv'])
-            
-            # Add historical reference data
-            hist_ref = get_iv_historical_reference(symbol)
-            snapshot['historical_reference'] = {
-                'historical_avg': hist_ref['historical_avg'],
-                'historical_avg_formatted': hist_ref['historical_avg_formatted'],
-                'typical_low': hist_ref['typical_range']['low'],
-                'typical_high': hist_ref['typical_range']['high'],
-                'current_vs_average': None if hist_ref['historical_avg'] is None else 
-                    round(snapshot['average_iv'] - hist_ref['historical_avg'], 4),
-                'current_vs_average_pct': None if hist_ref['historical_avg'] is None else
-                    f"{((snapshot['average_iv'] / hist_ref['historical_avg'] - 1) * 100):.2f}%"
-            }
-            
-            results[symbol] = snapshot
+    # Each symbol is an independent blocking Yahoo round-trip, so fetch them concurrently;
+    # progress lines are printed here as they complete, results keep config order
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(SECTOR_ETFS)))) as executor, \
+            open(PARTIAL_PATH, 'wb') as partial:
+        futures = {executor.submit(_fetch_symbol, symbol, info): symbol for symbol, info in SECTOR_ETFS.items()}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            snapshot = fetched[symbol] = future.result()
+            info = SECTOR_ETFS[symbol]
+            if snapshot:
+                partial.write(dumps_json({'symbol': symbol, 'snapshot': snapshot}, indent=None,
+                                         default=serialize_for_json) + b'\n')
+                partial.flush()
+                print(f"Fetching {symbol} ({info['sector']})... ✅ IV: {snapshot['average_iv_formatted']}")
+            else:
+                print(f"Fetching {symbol} ({info['sector']})... ❌ Failed")
+    
+    for symbol in SECTOR_ETFS:
+        if fetched[symbol]:
+            results[symbol] = fetched[symbol]
             success_count += 1
-            print(f"✅ IV: {snapshot['average_iv_formatted']}")
-        else:
-            print("❌ Failed")
     
     print()
     print(f"Successfully fetched: {success_count}/{len(SECTOR_ETFS)}")
@@ -99,40 +172,10 @@ def fetch_sector_etfs_snapshot():
     # Build output
     output = {
         '_README': {
-            'description': 'Implied volatility snapshot for S&P 500 sector ETFs',
-            'data_source': 'yfinance (Yahoo Finance) - Options data',
-            'update_frequency': 'Real-time (run script to update)',
+            **_README_STATIC,
             'last_updated': datetime.now(ET).isoformat(),
             'num_symbols': len(results),
             'symbols': list(results.keys()),
-            'options_criteria': {
-                'min_days_to_expiration': OPTIONS_CRITERIA['min_dte'],
-                'max_days_to_expiration': OPTIONS_CRITERIA['max_dte'],
-                'atm_tolerance': f"{OPTIONS_CRITERIA['atm_tolerance']*100}%"
-            },
-            'fields_explanation': {
-                'current_price': 'Current ETF price',
-                'expiration_date': 'Option expiration date used',
-                'days_to_expiration': 'Days until expiration',
-                'average_iv': 'Average of ATM call and put implied volatility',
-                'average_iv_formatted': 'IV as percentage (e.g., 25.50%)',
-                'iv_level': 'Classification: Low, Normal, Elevated, High, Extreme',
-                'atm_call': 'ATM call option details (strike, IV, prices, liquidity)',
-                'atm_put': 'ATM put option details (strike, IV, prices, liquidity)',
-                'moneyness': 'Strike / Underlying price',
-                'pct_from_atm': 'Percentage difference from ATM',
-                'volume': 'Option trading volume today',
-                'open_interest': 'Total open option contracts',
-                'bid_ask_spread': 'Difference between bid and ask',
-                'spread_pct': 'Bid-ask spread as % of mid price'
-            },
-            'interpretation': {
-                'low_iv': 'IV < 15% - Market expects low volatility, options are cheap',
-                'normal_iv': 'IV 15-25% - Typical market conditions',
-                'elevated_iv': 'IV 25-35% - Market expects higher volatility',
-                'high_iv': 'IV 35-50% - Significant uncertainty expected',
-                'extreme_iv': 'IV > 50% - Extreme volatility expected (rare)'
-            }
         },
         'data': results
     }
@@ -148,16 +191,17 @@ def main():
     # Fetch snapshot
     snapshot_data = fetch_sector_etfs_snapshot()
     
-    # Save snapshot
-    snapshot_path = Path(__file__).parent / OUTPUT_CONFIG['snapshot']
-    with open(snapshot_path, 'w') as f:
-        json.dump(snapshot_data, f, indent=2, default=serialize_for_json)
-    print(f"\n✅ Snapshot saved: {snapshot_path}")
-    print(f"   Size: {snapshot_path.stat().st_size:,} bytes")
+    # Save snapshot (written to a temp file and swapped in, so readers never see a partial file)
+    tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + '.tmp')
+    write_json(snapshot_data, tmp_path, default=serialize_for_json)
+    os.replace(tmp_path, SNAPSHOT_PATH)
+    PARTIAL_PATH.unlink(missing_ok=True)
+    print(f"\n✅ Snapshot saved: {SNAPSHOT_PATH}")
+    print(f"   Size: {SNAPSHOT_PATH.stat().st_size:,} bytes")
     
-    print("\n" + "="*80)
+    print("\n" + _BAR80)
     print("SECTOR ETFs IV FETCH COMPLETE")
-    print("="*80)
+    print(_BAR80)
 
 
 if __name__ == "__main__":
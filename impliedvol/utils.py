@@ -10,18 +10,56 @@ Provides:
 - Historical IV reference ranges
 """
 
+import random
+import threading
+import time
+from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import yfinance as yf
 from typing import Dict, List, Optional, Tuple
+import requests
 import warnings
 warnings.filterwarnings('ignore')
 
+# Try to import curl_cffi (yfinance's HTTP backend) for one shared session per run
+try:
+    from curl_cffi import CurlError
+    from curl_cffi import requests as curl_requests
+    HAS_CURL_CFFI = True
+except ImportError:
+    HAS_CURL_CFFI = False
+
+# yfinance's rate-limit exception (newer yfinance releases only)
+try:
+    from yfinance.exceptions import YFRateLimitError
+    HAS_YF_RATE_LIMIT_ERROR = True
+except ImportError:
+    HAS_YF_RATE_LIMIT_ERROR = False
+
 # Use Eastern Time for market data timestamps
 ET = ZoneInfo('America/New_York')
 
+# Yahoo request policy shared by all fetcher threads: at most MAX_CONCURRENT_REQUESTS
+# in flight, and transient failures (throttling, 5xx, network errors) are retried with
+# exponential backoff of 0.5s, 1s, 2s plus jitter so workers don't retry in lockstep.
+# Anything else (no option chain, parse errors) fails at once
+MAX_CONCURRENT_REQUESTS = 6
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Network/transport errors worth retrying (HTTP errors are judged by status code)
+_TRANSPORT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+) + ((CurlError,) if HAS_CURL_CFFI else ())
+
 
 # Historical IV Reference Ranges (based on market research)
 # Source: Barchart, AlphaQuery, Investopedia (Nov 2025)
@@ -131,6 +169,67 @@ IV_HISTORICAL_AVERAGES = {
 }
 
 
+# Returned for symbols without reference data (shared, like the entries above; treat as read-only)
+UNKNOWN_IV_REFERENCE = {
+    "historical_avg": None,
+    "historical_avg_formatted": "N/A",
+    "typical_range": {"low": None, "high": None},
+    "description": "Unknown symbol"
+}
+
+
+def _is_transient(exc: Exception) -> bool:
+    """True for failures worth retrying: rate limiting (429), 5xx and network errors."""
+    if HAS_YF_RATE_LIMIT_ERROR and isinstance(exc, YFRateLimitError):
+        return True
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, _TRANSPORT_ERRORS)
+
+
+def yahoo_request(fetch, *args):
+    """
+    Run one blocking Yahoo request under the shared concurrency limit, retrying
+    transient failures.
+    
+    Args:
+        fetch: Callable doing the request (e.g. ticker.option_chain)
+        *args: Arguments for fetch
+    
+    Returns:
+        Result of fetch
+    
+    Raises:
+        A non-transient exception at once, or the last transient one once
+        MAX_RETRIES retries are exhausted
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            with _request_slots:
+                return fetch(*args)
+        except Exception as e:
+            if attempt == MAX_RETRIES or not _is_transient(e):
+                raise
+        # Back off outside the semaphore so other workers can use the slot
+        time.sleep(BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, 0.1))
+
+
+def make_session():
+    """
+    Create the HTTP session shared by all symbol fetches of a run.
+    
+    Passing one session to every yf.Ticker keeps connections (DNS, TCP and TLS)
+    and Yahoo's cookie/crumb alive across symbols instead of setting them up again.
+    
+    Returns:
+        curl_cffi Session, or None (yfinance's default session) if curl_cffi is unavailable
+    """
+    if not HAS_CURL_CFFI:
+        return None
+    return curl_requests.Session(impersonate="chrome")
+
+
 def get_iv_historical_reference(symbol: str) -> Dict:
     """
     Get historical IV reference data for a symbol.
@@ -139,14 +238,48 @@ def get_iv_historical_reference(symbol: str) -> Dict:
         symbol: Ticker symbol
         
     Returns:
-        Dictionary with historical average and typical range
+        Dictionary with historical average and typical range (shared, read-only)
     """
-    return IV_HISTORICAL_AVERAGES.get(symbol, {
-        "historical_avg": None,
-        "historical_avg_formatted": "N/A",
-        "typical_range": {"low": None, "high": None},
-        "description": "Unknown symbol"
-    })
+    return IV_HISTORICAL_AVERAGES.get(symbol, UNKNOWN_IV_REFERENCE)
+
+
+@dataclass(slots=True)
+class HistoricalRef:
+    """Current IV compared with a symbol's historical reference (one snapshot block)."""
+    historical_avg: Optional[float]
+    historical_avg_formatted: str
+    typical_low: Optional[float]
+    typical_high: Optional[float]
+    current_vs_average: Optional[float]
+    current_vs_average_pct: Optional[str]
+
+
+def build_historical_reference(average_iv: float, hist_ref: Dict) -> HistoricalRef:
+    """
+    Compare a snapshot's average IV with the symbol's historical reference.
+    
+    Args:
+        average_iv: Current average ATM IV
+        hist_ref: Reference entry from get_iv_historical_reference
+    
+    Returns:
+        HistoricalRef (use dataclasses.asdict for the snapshot's 'historical_reference' block)
+    """
+    historical_avg = hist_ref['historical_avg']
+    if historical_avg is None:
+        vs_average = vs_average_pct = None
+    else:
+        vs_average = round(average_iv - historical_avg, 4)
+        vs_average_pct = f"{((average_iv / historical_avg - 1) * 100):.2f}%"
+    
+    return HistoricalRef(
+        historical_avg=historical_avg,
+        historical_avg_formatted=hist_ref['historical_avg_formatted'],
+        typical_low=hist_ref['typical_range']['low'],
+        typical_high=hist_ref['typical_range']['high'],
+        current_vs_average=vs_average,
+        current_vs_average_pct=vs_average_pct,
+    )
 
 
 def calculate_iv_ma(iv_series: pd.Series, periods: List[int] = [20, 50]) -> Dict[str, float]:
@@ -162,10 +295,18 @@ def calculate_iv_ma(iv_series: pd.Series, periods: List[int] = [20, 50]) -> Dict
     """
     result = {}
     
+    # Running sums (with a leading 0) give every trailing-window mean from one
+    # pass over the values; NaNs are skipped, as in Series.mean()
+    values = iv_series.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+    
     for period in periods:
-        if len(iv_series) >= period:
-            ma_value = iv_series.tail(period).mean()
-            result[f'iv_ma_{period}'] = round(ma_value, 6)
+        if len(values) >= period:
+            total = csum[-1] - csum[-1 - period]
+            count = ccount[-1] - ccount[-1 - period]
+            result[f'iv_ma_{period}'] = round(float(total / count), 6) if count else float('nan')
         else:
             result[f'iv_ma_{period}'] = None
     
@@ -181,7 +322,8 @@ def find_atm_option(options_df: pd.DataFrame,
     Args:
         options_df: DataFrame with option chain data
         underlying_price: Current price of underlying
-        tolerance: Max % difference from ATM (default 2%)
+        tolerance: Max % difference from ATM (default 2%); the closest strike
+            is returned even when none falls inside it
     
     Returns:
         Series with ATM option data, or None if not found
@@ -189,22 +331,13 @@ def find_atm_option(options_df: pd.DataFrame,
     if len(options_df) == 0:
         return None
     
-    # Calculate distance from ATM
-    options_df = options_df.copy()
-    options_df['strike_diff'] = abs(options_df['strike'] - underlying_price)
-    options_df['strike_pct_diff'] = options_df['strike_diff'] / underlying_price
-    
-    # Filter within tolerance
-    atm_options = options_df[options_df['strike_pct_diff'] <= tolerance]
-    
-    if len(atm_options) == 0:
-        # If none within tolerance, take closest
-        atm_idx = options_df['strike_diff'].idxmin()
-        return options_df.loc[atm_idx]
-    
-    # Find closest to ATM
-    atm_idx = atm_options['strike_diff'].idxmin()
-    return atm_options.loc[atm_idx]
+    # The closest strike is within tolerance whenever any strike is, so one
+    # vectorized argmin over the strike column picks the ATM row either way
+    # (first row on ties, NaN strikes skipped)
+    strike_diff = np.abs(options_df['strike'].to_numpy(dtype=float) - underlying_price)
+    if np.isnan(strike_diff).all():
+        return None
+    return options_df.iloc[int(np.nanargmin(strike_diff))]
 
 
 def calculate_moneyness(strike: float, underlying_price: float) -> Dict[str, any]:
@@ -265,7 +398,7 @@ def calculate_option_liquidity(option: pd.Series) -> Dict[str, any]:
 
 def filter_options_by_dte(ticker: yf.Ticker, 
                           min_dte: int = 7,
-                          max_dte: int = 60) -> Optional[Tuple[str, pd.DataFrame, pd.DataFrame]]:
+                          max_dte: int = 60) -> Optional[Tuple[str, pd.DataFrame, pd.DataFrame, Dict]]:
     """
     Get option chain filtered by days to expiration.
     
@@ -275,10 +408,11 @@ def filter_options_by_dte(ticker: yf.Ticker,
         max_dte: Maximum days to expiration
     
     Returns:
-        Tuple of (expiration_date, calls_df, puts_df) or None
+        Tuple of (expiration_date, calls_df, puts_df, underlying_quote) or None
+        (underlying_quote is the quote Yahoo returns with the chain, {} if absent)
     """
     try:
-        expirations = ticker.options
+        expirations = yahoo_request(lambda: ticker.options)
         if not expirations:
             return None
         
@@ -291,23 +425,41 @@ def filter_options_by_dte(ticker: yf.Ticker,
             
             if min_dte <= dte <= max_dte:
                 # Get option chain
-                opt_chain = ticker.option_chain(exp_str)
-                return (exp_str, opt_chain.calls, opt_chain.puts)
+                opt_chain = yahoo_request(ticker.option_chain, exp_str)
+                return (exp_str, opt_chain.calls, opt_chain.puts, getattr(opt_chain, 'underlying', None) or {})
         
         # If no expiration in range, use nearest
         nearest_exp = expirations[0]
-        opt_chain = ticker.option_chain(nearest_exp)
-        return (nearest_exp, opt_chain.calls, opt_chain.puts)
+        opt_chain = yahoo_request(ticker.option_chain, nearest_exp)
+        return (nearest_exp, opt_chain.calls, opt_chain.puts, getattr(opt_chain, 'underlying', None) or {})
         
     except Exception as e:
         print(f"Error filtering options: {e}")
         return None
 
 
+def _atm_option_fields(option: pd.Series, underlying_price: float) -> Dict:
+    """Snapshot fields for one ATM option row (prices, IV, moneyness, liquidity)."""
+    strike = float(option['strike'])
+    bid = float(option['bid'])
+    ask = float(option['ask'])
+    return {
+        'strike': strike,
+        'implied_volatility': round(float(option['impliedVolatility']), 6),
+        'last_price': round(float(option['lastPrice']), 4),
+        'bid': round(bid, 4),
+        'ask': round(ask, 4),
+        'mid_price': round((bid + ask) / 2, 4),
+        **calculate_moneyness(strike, underlying_price),
+        **calculate_option_liquidity(option)
+    }
+
+
 def get_option_snapshot(symbol: str,
                        min_dte: int = 7,
                        max_dte: int = 60,
-                       atm_tolerance: float = 0.02) -> Optional[Dict]:
+                       atm_tolerance: float = 0.02,
+                       session=None) -> Optional[Dict]:
     """
     Get comprehensive option snapshot for a symbol.
     
@@ -316,26 +468,29 @@ def get_option_snapshot(symbol: str,
         min_dte: Minimum days to expiration
         max_dte: Maximum days to expiration
         atm_tolerance: ATM tolerance (%)
+        session: Shared HTTP session from make_session() (None = yfinance default)
     
     Returns:
         Dict with current price, ATM call/put IV, option details
     """
     try:
-        ticker = yf.Ticker(symbol)
-        
-        # Get current price
-        hist = ticker.history(period="1d")
-        if len(hist) == 0:
-            return None
-        
-        current_price = hist['Close'].iloc[-1]
+        ticker = yf.Ticker(symbol, session=session)
         
         # Get options
         opt_data = filter_options_by_dte(ticker, min_dte, max_dte)
         if not opt_data:
             return None
         
-        exp_date, calls, puts = opt_data
+        exp_date, calls, puts, underlying = opt_data
+        
+        # Get current price from the quote that comes with the chain (saves a
+        # price-history round-trip); fall back to the last close if it's missing
+        current_price = underlying.get('regularMarketPrice')
+        if current_price is None:
+            hist = yahoo_request(ticker.history, "1d")
+            if len(hist) == 0:
+                return None
+            current_price = hist['Close'].iloc[-1]
         
         # Calculate DTE
         exp_dt = datetime.strptime(exp_date, '%Y-%m-%d').date()
@@ -357,29 +512,9 @@ def get_option_snapshot(symbol: str,
             'expiration_date': exp_date,
             'days_to_expiration': dte,
             
-            # ATM Call data
-            'atm_call': {
-                'strike': float(atm_call['strike']),
-                'implied_volatility': round(float(atm_call['impliedVolatility']), 6),
-                'last_price': round(float(atm_call['lastPrice']), 4),
-                'bid': round(float(atm_call['bid']), 4),
-                'ask': round(float(atm_call['ask']), 4),
-                'mid_price': round((float(atm_call['bid']) + float(atm_call['ask'])) / 2, 4),
-                **calculate_moneyness(float(atm_call['strike']), current_price),
-                **calculate_option_liquidity(atm_call)
-            },
-            
-            # ATM Put data
-            'atm_put': {
-                'strike': float(atm_put['strike']),
-                'implied_volatility': round(float(atm_put['impliedVolatility']), 6),
-                'last_price': round(float(atm_put['lastPrice']), 4),
-                'bid': round(float(atm_put['bid']), 4),
-                'ask': round(float(atm_put['ask']), 4),
-                'mid_price': round((float(atm_put['bid']) + float(atm_put['ask'])) / 2, 4),
-                **calculate_moneyness(float(atm_put['strike']), current_price),
-                **calculate_option_liquidity(atm_put)
-            },
+            # ATM Call / Put data
+            'atm_call': _atm_option_fields(atm_call, current_price),
+            'atm_put': _atm_option_fields(atm_put, current_price),
             
             # Average IV (mid of ATM call and put)
             'average_iv': round((float(atm_call['impliedVolatility']) + float(atm_put['impliedVolatility'])) / 2, 6)
@@ -6,6 +6,10 @@ This package provides common functionality used across multiple data collection
 - sector_mapping: GICS sector classifications
 - cache_manager: Intelligent caching for yfinance data
 - yfinance_fetcher: Centralized data downloads with caching
+- json_io: Fast JSON read/write (orjson with stdlib fallback)
+- config_io: Cached YAML config loading
+- earnings_cache: Parsed earnings surprises cache (NumPy column arrays)
+- earnings_kernels: Earnings surprise kernels (numba-compiled when available)
 
 Usage:
     from shared.spx_universe import fetch_spx_tickers
@@ -0,0 +1,43 @@
+"""
+YAML configuration loading with per-process caching.
+
+Parses with the libyaml C loader when PyYAML was built with it (falls back to
+the pure-Python SafeLoader) and memoizes the result per resolved path, so
+repeated loads in one process skip both the disk read and the parse.
+
+Usage:
+    from shared.config_io import load_yaml_config
+
+    config = load_yaml_config(Path(__file__).parent / 'config.yml')
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import yaml
+
+# Prefer the libyaml C backend (several times faster than the pure-Python loader)
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=16)
+def _load_resolved(resolved_path: str) -> Dict[str, Any]:
+    """Parse a YAML file (cached by resolved path)."""
+    with open(resolved_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def load_yaml_config(config_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load a YAML config file, parsing it at most once per process.
+
+    The returned dict is shared between callers; treat it as read-only.
+
+    Args:
+        config_path: Path to the YAML file (relative paths resolve against CWD)
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    return _load_resolved(str(Path(config_path).resolve()))
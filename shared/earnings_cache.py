@@ -0,0 +1,212 @@
+"""
+Parsed earnings surprises cache.
+
+The raw Finnhub earnings file (earnings_surprises.json) is read by several
+analysis scripts in a row. The first one to run parses the JSON and stores the
+quarters as fixed-dtype column arrays (SoA, grouped by ticker) in an .npz next
+to it; later runs load the arrays instead of re-tokenizing the JSON. The cache
+is keyed on the raw file's size and mtime and rebuilt when either changes.
+With ijson installed the raw file is parsed incrementally, one ticker at a
+time, so the full dict-of-lists is never held in memory.
+
+Usage:
+    from shared.earnings_cache import load_or_parse
+
+    table = load_or_parse("earnings_surprises.json")
+    rows = table.ticker_rows("AAPL")  # list of quarter dicts, as in the raw file
+    cols = table.ticker_columns("AAPL")  # dict of column array views (+ 'int_mask')
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .json_io import read_json
+
+# Try to import ijson for incremental parsing of the raw file
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Float columns: NaN marks a missing value (None in the raw file)
+FLOAT_FIELDS = ('actual', 'estimate', 'surprise', 'surprisePercent')
+# Integer columns: 0 marks a missing value
+INT_FIELDS = ('quarter', 'year')
+# All per-quarter columns, keyed by their raw-file field names
+COLUMN_FIELDS = ('period',) + INT_FIELDS + FLOAT_FIELDS
+# Per-row flags column: bit i set = FLOAT_FIELDS[i] was an integer in the raw file,
+# so values like 2 are written back as 2 rather than 2.0
+INT_MASK = 'int_mask'
+
+
+def column_to_list(name: str, values: np.ndarray,
+                   int_mask: Optional[np.ndarray] = None) -> list:
+    """
+    Convert one column back to raw-file Python values.
+
+    Args:
+        name: Raw field name (one of COLUMN_FIELDS)
+        values: Column array
+        int_mask: The rows' INT_MASK flags (same order as values); float values
+                  that were integers in the raw file come back as int
+
+    Returns:
+        List of values, with missing markers ('' / 0 / NaN) turned back into None
+    """
+    if name in FLOAT_FIELDS:
+        if int_mask is not None:
+            is_int = (int_mask & (1 << FLOAT_FIELDS.index(name))).astype(bool).tolist()
+            return [None if v != v else int(v) if whole else v
+                    for v, whole in zip(values.tolist(), is_int)]
+        return [None if v != v else v for v in values.tolist()]
+    return [v or None for v in values.tolist()]
+
+
+def columns_to_rows(columns: Dict[str, np.ndarray]) -> List[dict]:
+    """
+    Rebuild quarter dicts shaped like the raw JSON records from column arrays.
+
+    Args:
+        columns: Column arrays keyed by raw field name (any subset of COLUMN_FIELDS),
+                 optionally with the rows' INT_MASK flags
+
+    Returns:
+        List of quarter dicts, one per row (missing values are None)
+    """
+    int_mask = columns.get(INT_MASK)
+    names = [name for name in columns if name != INT_MASK]
+    lists = [column_to_list(name, columns[name], int_mask) for name in names]
+    return [dict(zip(names, row)) for row in zip(*lists)]
+
+
+@dataclass
+class EarningsTable:
+    """Earnings quarters as parallel column arrays, grouped by ticker."""
+    tickers: np.ndarray             # (n_tickers,) ticker symbols
+    offsets: np.ndarray             # (n_tickers + 1,) row offsets; ticker i owns rows offsets[i]:offsets[i+1]
+    period: np.ndarray              # (n_rows,) period end date ('' when missing)
+    quarter: np.ndarray             # (n_rows,) int16
+    year: np.ndarray                # (n_rows,) int16
+    actual: np.ndarray              # (n_rows,) float64
+    estimate: np.ndarray
+    surprise: np.ndarray
+    surprisePercent: np.ndarray
+    int_mask: np.ndarray            # (n_rows,) uint8 INT_MASK flags
+    index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.index
+
+    def ticker_columns(self, ticker: str) -> Dict[str, np.ndarray]:
+        """
+        One ticker's quarters as column array views, keyed by raw field name.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            Dict of COLUMN_FIELDS and INT_MASK -> array slice (file order)
+        """
+        i = self.index[ticker]
+        rows = slice(self.offsets[i], self.offsets[i + 1])
+        return {name: getattr(self, name)[rows] for name in COLUMN_FIELDS + (INT_MASK,)}
+
+    def ticker_rows(self, ticker: str) -> List[dict]:
+        """
+        Rebuild one ticker's quarters as dicts shaped like the raw JSON records.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            List of quarter dicts (missing values are None)
+        """
+        return columns_to_rows(self.ticker_columns(ticker))
+
+
+def _iter_raw(raw_json_path: Path) -> Iterator[Tuple[str, List[dict]]]:
+    """Yield (ticker, quarters) from the raw file's "data" object, in file order."""
+    if HAS_IJSON:
+        with open(raw_json_path, 'rb') as f:
+            yield from ijson.kvitems(f, 'data', use_float=True)
+    else:
+        yield from read_json(raw_json_path)['data'].items()
+
+
+def _parse_raw(raw_json_path: Path) -> Dict[str, np.ndarray]:
+    """Parse the raw earnings JSON into column arrays (one ticker at a time)."""
+    tickers = []
+    counts = [0]
+    columns = {name: [] for name in COLUMN_FIELDS + (INT_MASK,)}
+    for ticker, quarters in _iter_raw(raw_json_path):
+        tickers.append(ticker)
+        counts.append(len(quarters))
+        columns['period'].extend(q_data.get('period') or '' for q_data in quarters)
+        for name in INT_FIELDS:
+            columns[name].extend(q_data.get(name) or 0 for q_data in quarters)
+        for name in FLOAT_FIELDS:
+            columns[name].extend(q_data.get(name) for q_data in quarters)
+        columns[INT_MASK].extend(
+            sum(1 << bit for bit, name in enumerate(FLOAT_FIELDS) if type(q_data.get(name)) is int)
+            for q_data in quarters
+        )
+
+    arrays = {
+        'tickers': np.array(tickers, dtype=str),
+        'offsets': np.cumsum(counts, dtype=np.int64),
+        'period': np.array(columns['period'], dtype=str),
+    }
+    for name in INT_FIELDS:
+        arrays[name] = np.array(columns[name], dtype=np.int16)
+    for name in FLOAT_FIELDS:
+        arrays[name] = np.array(columns[name], dtype=np.float64)
+    arrays[INT_MASK] = np.array(columns[INT_MASK], dtype=np.uint8)
+    return arrays
+
+
+def load_or_parse(raw_json_path: Union[str, Path],
+                  cache_path: Optional[Union[str, Path]] = None) -> EarningsTable:
+    """
+    Load the earnings table from the .npz cache, reparsing the raw JSON if stale.
+
+    Args:
+        raw_json_path: Raw earnings surprises JSON ({"data": {ticker: [quarters]}})
+        cache_path: Cache file (default: <raw stem>.cache.npz next to the raw file)
+
+    Returns:
+        EarningsTable
+    """
+    raw_json_path = Path(raw_json_path)
+    cache_path = Path(cache_path) if cache_path else raw_json_path.with_suffix('.cache.npz')
+    stat = raw_json_path.stat()
+    source_stat = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    if cache_path.exists():
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if np.array_equal(cached['source_stat'], source_stat):
+                    return EarningsTable(**{name: cached[name] for name in cached.files
+                                            if name != 'source_stat'})
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Corrupt or outdated layout (e.g. no int_mask column): rebuild below
+
+    arrays = _parse_raw(raw_json_path)
+
+    # Write to a temp file and swap in, so a concurrent reader never sees a partial cache
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, source_stat=source_stat, **arrays)
+    os.replace(tmp_path, cache_path)
+
+    return EarningsTable(**arrays)
@@ -0,0 +1,105 @@
+"""
+Earnings surprise classification and kernels shared by the earnings analyzers.
+
+Surprise categories are assigned to whole arrays at once (classify_codes). The
+per-company loops that don't vectorize well run as numba-compiled kernels when
+numba is installed, and as plain Python otherwise.
+
+Usage:
+    from shared.earnings_kernels import CATEGORY_NAMES, category_bounds, classify_codes, beat_streak
+
+    bounds = category_bounds(config['surprise_classification'])
+    codes = classify_codes(surprise_pct, bounds)  # indices into CATEGORY_NAMES
+    streak = int(beat_streak(surprises_desc, beat_threshold, meet_threshold))
+"""
+
+import numpy as np
+
+# Try to import numba for JIT-compiled kernels
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit: kernels run as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Surprise categories indexed by category code (ascending surprise)
+CATEGORY_NAMES = ('strong_miss', 'miss', 'meet', 'beat', 'strong_beat')
+
+
+def category_bounds(thresholds):
+    """
+    Category boundaries for classify_codes.
+
+    The miss and meet lower bounds are inclusive (>=); the beat and strong_beat
+    bounds are exclusive (>), matching the scalar classifiers' branch order for
+    thresholds ordered as in config.yml (miss <= -meet <= beat <= meet).
+
+    Args:
+        thresholds: surprise_classification section of config.yml
+
+    Returns:
+        (closed_bounds, open_bounds) float64 arrays
+    """
+    closed_bounds = np.array([float(thresholds['miss_threshold']),
+                              -float(thresholds['meet_threshold'])])
+    open_bounds = np.array([float(thresholds['beat_threshold']),
+                            float(thresholds['strong_beat_threshold'])])
+    return closed_bounds, open_bounds
+
+
+def classify_codes(surprise_pct, bounds):
+    """
+    Classify an array of surprise percents in one vectorized pass.
+
+    Args:
+        surprise_pct: NumPy array of surprise percentages (no NaN)
+        bounds: (closed_bounds, open_bounds) from category_bounds
+
+    Returns:
+        Array of category codes (indices into CATEGORY_NAMES)
+    """
+    closed_bounds, open_bounds = bounds
+    codes = np.searchsorted(closed_bounds, surprise_pct, side='right')
+    codes += np.searchsorted(open_bounds, surprise_pct, side='left')
+    return codes
+
+
+# Explicit signature: compiled eagerly at import and cached on disk (__pycache__),
+# so only the first run after a change pays the compile
+@njit('int64(float64[:], float64, float64)', cache=True, nogil=True)
+def beat_streak(surprise_pct, beat_threshold, meet_threshold):
+    """
+    Current beat (+) / miss (-) streak.
+
+    Args:
+        surprise_pct: float64 array of surprise percents, most recent first
+                      (NaN = missing surprise)
+        beat_threshold: Surprises above this are beats (incl. strong beats)
+        meet_threshold: Surprises within ± this are meets
+
+    Returns:
+        Number of consecutive beats (positive) or misses (negative); a meet,
+        a missing value or a change of direction ends the streak
+    """
+    streak = 0
+    for surprise in surprise_pct:
+        if surprise != surprise:
+            break
+        if surprise > beat_threshold:
+            if streak < 0:
+                break
+            streak += 1
+        elif abs(surprise) <= meet_threshold:
+            break
+        else:
+            if streak > 0:
+                break
+            streak -= 1
+    return streak
@@ -23,14 +23,18 @@ def calculate_percentile_rank(series: pd.Series, current_value: float) -> float:
     if series.empty or pd.isna(current_value):
         return 50.0  # Default to neutral
     
-    # Remove NaN values
-    valid_series = series.dropna()
-    if len(valid_series) == 0:
+    # Only one rank is needed, so count in a linear pass rather than sorting
+    # (sort + searchsorted only pays off when ranking many values against one
+    # history). NaN compares False, so it never counts as below, and it is
+    # excluded from the total without building a cleaned copy
+    values = series.to_numpy(dtype=np.float64)
+    valid_count = len(values) - np.count_nonzero(np.isnan(values))
+    if valid_count == 0:
         return 50.0
     
     # Calculate percentile
-    below_count = (valid_series < current_value).sum()
-    percentile = (below_count / len(valid_series)) * 100.0
+    below_count = np.count_nonzero(values < current_value)
+    percentile = (below_count / valid_count) * 100.0
     
     return round(percentile, 2)
 
@@ -327,9 +331,11 @@ def calculate_change_metrics(
     if df.empty or "value" not in df.columns:
         return {}
     
-    df_clean = df.dropna(subset=["value"])
+    # Only the value column is needed: drop NaNs with a mask instead of copying the frame
+    values = df["value"].to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values)]
     
-    if df_clean.empty:
+    if len(values) == 0:
         return {"1y": None, "5y": None, "10y": None, "20y": None}
     
     # V2: Default to year-based periods if not specified
@@ -352,11 +358,11 @@ def calculate_change_metrics(
             periods = {"1y": 12, "5y": 60, "10y": 120, "20y": 240}
     
     changes = {}
-    current_value = df_clean.iloc[-1]["value"]
+    current_value = values[-1]
     
     for period_name, num_periods in periods.items():
-        if len(df_clean) > num_periods:
-            past_value = df_clean.iloc[-(num_periods + 1)]["value"]
+        if len(values) > num_periods:
+            past_value = values[-(num_periods + 1)]
             if past_value != 0:
                 pct_change = ((current_value - past_value) / abs(past_value)) * 100
                 changes[period_name] = round(pct_change, 2)
@@ -512,3 +518,43 @@ def adaptive_resample(
     monthly = monthly.dropna(subset=["value"])
     
     return monthly
+
+
+# Regular cadences produced by FRED observations and adaptive_resample output
+# ("ME"/"QE" are the pandas >= 2.2 month-/quarter-end aliases)
+_HISTORY_DATE_FREQUENCIES = ("MS", "ME", "QS", "QE")
+
+
+def encode_history_dates(dates: pd.Series) -> Dict[str, Any]:
+    """
+    Encode a history date column compactly for JSON output.
+    
+    Evenly spaced series (monthly/quarterly, start- or end-anchored) collapse to
+    a range descriptor; anything else falls back to integer epoch days.
+    Consumers rebuild dates with pd.date_range(start, periods=n, freq=freq)
+    or pd.to_datetime(epoch_days, unit="D").
+    
+    Args:
+        dates: Series of datetimes in ascending order
+        
+    Returns:
+        {"date_range": {"start", "freq", "n"}} or {"epoch_days": [...]}
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(dates))
+    if index.empty:
+        return {"epoch_days": []}
+    
+    start = index[0]
+    for freq in _HISTORY_DATE_FREQUENCIES:
+        expected = pd.date_range(start=start, periods=len(index), freq=freq)
+        if expected.equals(index):
+            return {
+                "date_range": {
+                    "start": start.strftime("%Y-%m-%d"),
+                    "freq": freq,
+                    "n": len(index),
+                }
+            }
+    
+    epoch_days = index.values.astype("datetime64[D]").astype("int64")
+    return {"epoch_days": epoch_days.tolist()}
@@ -4,10 +4,13 @@ Input/Output Operations
 Handles configuration loading and file operations.
 """
 import json
+import os
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from json_io import dumps_json
+
 
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -73,16 +76,21 @@ def save_json(data: Dict[str, Any], output_path: str, indent: int = 2) -> None:
     """
     Save data to JSON file.
     
+    Encoded in one C call with orjson when installed (UTF-8, non-ASCII kept
+    as-is like ensure_ascii=False), stdlib json otherwise. The file is written
+    to a temp file and swapped in, so readers never see a partial file.
+    
     Args:
         data: Data to save
         output_path: Path to output file
-        indent: JSON indentation (default 2)
+        indent: JSON indentation (default 2; None for compact output)
     """
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    tmp_file.write_bytes(dumps_json(data, indent=indent))
+    os.replace(tmp_file, output_file)
     
     print(f"✓ Saved: {output_file}")
 
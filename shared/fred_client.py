@@ -5,28 +5,41 @@ Handles all interactions with the Federal Reserve Economic Data (FRED) API.
 """
 import os
 import time
+import threading
 import requests
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
+from pathlib import Path
 import pandas as pd
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Default location of the on-disk observations cache (see FREDClient cache_dir)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "deanfi" / "fred"
+
 
 class FREDClient:
     """Client for interacting with FRED API."""
     
     BASE_URL = "https://api.stlouisfed.org/fred"
     
-    def __init__(self, api_key: Optional[str] = None, rate_limit: float = 0.1):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limit: float = 0.1,
+        cache_dir: Optional[Path] = None,
+        cache_ttl: float = 0
+    ):
         """
         Initialize FRED API client.
         
         Args:
             api_key: FRED API key (if None, reads from FRED_API_KEY env var)
             rate_limit: Minimum seconds between API requests (default 0.1)
+            cache_dir: Directory for cached observations as parquet (None disables caching)
+            cache_ttl: Seconds a cached series stays fresh (0 disables caching)
         """
         self.api_key = api_key or os.getenv("FRED_API_KEY")
         if not self.api_key:
@@ -37,14 +50,18 @@ class FREDClient:
         
         self.rate_limit = rate_limit
         self._last_request_time = 0
+        self._rate_lock = threading.Lock()
         self.session = requests.Session()
+        self.cache_dir = Path(cache_dir) if cache_dir and cache_ttl > 0 else None
+        self.cache_ttl = cache_ttl
     
     def _rate_limit_wait(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
-        self._last_request_time = time.time()
+        """Enforce rate limiting between requests (thread-safe: callers queue on the lock)."""
+        with self._rate_lock:
+            elapsed = time.time() - self._last_request_time
+            if elapsed < self.rate_limit:
+                time.sleep(self.rate_limit - elapsed)
+            self._last_request_time = time.time()
     
     def _make_request(
         self, 
@@ -82,6 +99,35 @@ class FREDClient:
 
         return response.json()
     
+    def _cache_path(self, series_id: str, start: Optional[str], end: Optional[str]) -> Optional[Path]:
+        """Get the cache file for an observations request, or None if caching is disabled."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{series_id}_{start or 'start'}_{end or 'latest'}.parquet"
+    
+    def _cache_get(self, path: Optional[Path]) -> Optional[pd.DataFrame]:
+        """Return a fresh cached DataFrame, or None on miss/expiry."""
+        if path is None:
+            return None
+        try:
+            if time.time() - path.stat().st_mtime >= self.cache_ttl:
+                return None
+            return pd.read_parquet(path)
+        except (OSError, ValueError, ImportError):
+            return None  # Missing, unreadable, or no parquet engine installed
+    
+    def _cache_put(self, path: Optional[Path], df: pd.DataFrame) -> None:
+        """Store a DataFrame in the cache (atomic replace, failures are non-fatal)."""
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"Warning: FRED cache write failed for {path.name}: {e}")
+    
     def get_series_info(self, series_id: str) -> Dict[str, Any]:
         """
         Get metadata about a FRED series.
@@ -123,6 +169,12 @@ class FREDClient:
         if observation_end or end_date:
             params["observation_end"] = observation_end or end_date
         
+        # Serve repeated downloads of the same window from disk while fresh
+        cache_path = self._cache_path(series_id, params.get("observation_start"), params.get("observation_end"))
+        cached = self._cache_get(cache_path)
+        if cached is not None:
+            return cached
+        
         result = self._make_request("series/observations", params)
         observations = result.get("observations", [])
         
@@ -144,6 +196,7 @@ class FREDClient:
         # Sort by date
         df = df.sort_values("date").reset_index(drop=True)
         
+        self._cache_put(cache_path, df)
         return df
     
     def get_latest_observation(self, series_id: str) -> Optional[float]:
@@ -0,0 +1,154 @@
+"""
+Fast JSON serialization helpers.
+
+Uses orjson (C extension, typically 3-10x faster than the stdlib encoder) when
+installed and falls back to the stdlib json module otherwise. Output is UTF-8
+either way.
+
+Usage:
+    from shared.json_io import write_json, read_json
+
+    write_json(data, "output.json")            # 2-space indent
+    write_json(data, "output.json", indent=None)  # compact
+    write_json_stream(head, "sectors", sector_items, "output.json")  # one record at a time
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple, Union
+
+# Try to import orjson for fast serialization
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Buffer size for streamed writes: record-sized writes coalesce into few syscalls
+_STREAM_BUFFER_SIZE = 1 << 20
+
+
+def dumps_json(data: Any, indent: Optional[int] = 2,
+               default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes.
+
+    Args:
+        data: JSON-serializable object
+        indent: 2 for pretty-printed output, None/0 for compact output
+                (orjson only supports 2-space indentation)
+        default: Called for objects the encoder can't serialize natively
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if HAS_ORJSON:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        return orjson.dumps(data, default=default, option=option)
+
+    separators = None if indent else (',', ':')
+    return json.dumps(
+        data, indent=indent or None, separators=separators, ensure_ascii=False, default=default
+    ).encode('utf-8')
+
+
+def write_json(data: Any, output_path: Union[str, Path], indent: Optional[int] = 2,
+               default: Optional[Callable[[Any], Any]] = None) -> Path:
+    """
+    Write data to a JSON file.
+
+    Args:
+        data: JSON-serializable object
+        output_path: Destination file
+        indent: 2 for pretty-printed output, None/0 for compact output
+        default: Called for objects the encoder can't serialize natively
+
+    Returns:
+        Path of the written file
+    """
+    output_file = Path(output_path)
+    output_file.write_bytes(dumps_json(data, indent=indent, default=default))
+    return output_file
+
+
+def write_json_stream(
+    head: Mapping[str, Any],
+    items_key: str,
+    items: Iterable[Tuple[str, Any]],
+    output_path: Union[str, Path],
+    indent: Optional[int] = 2,
+) -> Path:
+    """
+    Write `{**head, items_key: dict(items)}` to a JSON file, one item at a time.
+
+    Each item is encoded and written on its own, so only one record's bytes are
+    in memory at once and `items` may be a generator. The file content matches
+    write_json on the equivalent dict.
+
+    Args:
+        head: Leading top-level fields (must not contain items_key)
+        items_key: Top-level key of the streamed object
+        items: (key, value) pairs of the streamed object
+        output_path: Destination file
+        indent: 2 for pretty-printed output, None/0 for compact output
+
+    Returns:
+        Path of the written file
+    """
+    output_file = Path(output_path)
+
+    # Encode the head with an empty placeholder object and cut at the placeholder
+    prefix = dumps_json({**head, items_key: {}}, indent=indent)
+    prefix = prefix[:prefix.rindex(b'{}')]
+    if indent:
+        item_start, key_sep, close_items, close_empty = b'\n    ', b': ', b'\n  }\n}', b'}\n}'
+    else:
+        item_start, key_sep, close_items, close_empty = b'', b':', b'}}', b'}}'
+
+    with open(output_file, 'wb', buffering=_STREAM_BUFFER_SIZE) as f:
+        f.write(prefix + b'{')
+        separator = b''
+        for key, value in items:
+            encoded = dumps_json(value, indent=indent)
+            if indent:
+                # Nest two levels deep (raw newlines only occur between tokens)
+                encoded = encoded.replace(b'\n', b'\n    ')
+            f.write(separator + item_start + dumps_json(key, indent=indent) + key_sep + encoded)
+            separator = b','
+        f.write(close_items if separator else close_empty)
+
+    return output_file
+
+
+def loads_json(raw: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes or str.
+
+    Args:
+        raw: Encoded JSON document
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(input_path: Union[str, Path]) -> Any:
+    """
+    Read a JSON file.
+
+    Args:
+        input_path: Source file
+
+    Returns:
+        Parsed JSON data
+    """
+    return loads_json(Path(input_path).read_bytes())
@@ -18,7 +18,9 @@ GICS Sectors (11 total):
 11. Materials (XLB)
 """
 
-# Comprehensive ticker to sector mapping
+# Comprehensive ticker to sector mapping. A few reclassified tickers (GEHC, POOL,
+# LYV, MTCH) stay at their original position, outside their sector's block, so
+# key order (and get_tickers_by_sector order) is unchanged
 TICKER_TO_SECTOR = {
     # Information Technology (XLK)
     'AAPL': 'Information Technology', 'MSFT': 'Information Technology', 'NVDA': 'Information Technology',
@@ -53,13 +55,13 @@ TICKER_TO_SECTOR = {
     'CVS': 'Health Care', 'ZTS': 'Health Care', 'BDX': 'Health Care', 'HCA': 'Health Care',
     'MDT': 'Health Care', 'COR': 'Health Care', 'IQV': 'Health Care', 'IDXX': 'Health Care',
     'EW': 'Health Care', 'HUM': 'Health Care', 'CNC': 'Health Care', 'A': 'Health Care',
-    'RMD': 'Health Care', 'DXCM': 'Health Care', 'GEHC': 'Health Care', 'BIIB': 'Health Care',
+    'RMD': 'Health Care', 'DXCM': 'Health Care', 'GEHC': 'Industrials', 'BIIB': 'Health Care',
     'MRNA': 'Health Care', 'WST': 'Health Care', 'STE': 'Health Care', 'PODD': 'Health Care',
     'LH': 'Health Care', 'DGX': 'Health Care', 'RVTY': 'Health Care', 'BAX': 'Health Care',
     'ALGN': 'Health Care', 'HOLX': 'Health Care', 'MOH': 'Health Care', 'INCY': 'Health Care',
     'VTRS': 'Health Care', 'TECH': 'Health Care', 'SOLV': 'Health Care', 'UHS': 'Health Care',
     'CRL': 'Health Care', 'WAT': 'Health Care', 'HSIC': 'Health Care', 'DVA': 'Health Care',
-    'CTLT': 'Health Care', 'COO': 'Health Care', 'POOL': 'Health Care', 'TFX': 'Health Care',
+    'CTLT': 'Health Care', 'COO': 'Health Care', 'POOL': 'Consumer Discretionary', 'TFX': 'Health Care',
     'ZBH': 'Health Care', 'MTD': 'Health Care',
     
     # Financials (XLF)
@@ -100,10 +102,10 @@ TICKER_TO_SECTOR = {
     'RL': 'Consumer Discretionary', 'GRMN': 'Consumer Discretionary', 'DPZ': 'Consumer Discretionary',
     'WHR': 'Consumer Discretionary', 'NVR': 'Consumer Discretionary', 'PHM': 'Consumer Discretionary',
     'MHK': 'Consumer Discretionary', 'BBWI': 'Consumer Discretionary', 'LKQ': 'Consumer Discretionary',
-    'POOL': 'Consumer Discretionary', 'HAS': 'Consumer Discretionary', 'WSM': 'Consumer Discretionary',
+    'HAS': 'Consumer Discretionary', 'WSM': 'Consumer Discretionary',
     'BWA': 'Consumer Discretionary', 'KMX': 'Consumer Discretionary', 'BBY': 'Consumer Discretionary',
     'EXPE': 'Consumer Discretionary', 'UBER': 'Consumer Discretionary', 'DASH': 'Consumer Discretionary',
-    'LYV': 'Consumer Discretionary', 'MTCH': 'Consumer Discretionary', 'TGT': 'Consumer Discretionary',
+    'LYV': 'Communication Services', 'MTCH': 'Communication Services', 'TGT': 'Consumer Discretionary',
     'TKO': 'Consumer Discretionary',
     
     # Communication Services (XLC)
@@ -111,8 +113,8 @@ TICKER_TO_SECTOR = {
     'DIS': 'Communication Services', 'T': 'Communication Services', 'VZ': 'Communication Services',
     'CMCSA': 'Communication Services', 'TMUS': 'Communication Services', 'EA': 'Communication Services',
     'CHTR': 'Communication Services', 'WBD': 'Communication Services', 'TTWO': 'Communication Services',
-    'LYV': 'Communication Services', 'OMC': 'Communication Services', 'FOXA': 'Communication Services',
-    'IPG': 'Communication Services', 'NWSA': 'Communication Services', 'MTCH': 'Communication Services',
+    'OMC': 'Communication Services', 'FOXA': 'Communication Services',
+    'IPG': 'Communication Services', 'NWSA': 'Communication Services',
     'PARA': 'Communication Services', 'TTD': 'Communication Services', 'XYZ': 'Communication Services',
     
     # Industrials (XLI)
@@ -133,8 +135,8 @@ TICKER_TO_SECTOR = {
     'J': 'Industrials', 'SNA': 'Industrials', 'PNR': 'Industrials', 'DAY': 'Industrials',
     'GNRC': 'Industrials', 'IEX': 'Industrials', 'SWK': 'Industrials', 'NDSN': 'Industrials',
     'AOS': 'Industrials', 'CHRW': 'Industrials', 'JBHT': 'Industrials', 'EXPD': 'Industrials',
-    'ROL': 'Industrials', 'TXT': 'Industrials', 'ALLE': 'Industrials', 'LII': 'Industrials',
-    'TDY': 'Industrials', 'FTV': 'Industrials', 'GEHC': 'Industrials', 'EME': 'Industrials',
+    'ROL': 'Industrials', 'TXT': 'Industrials', 'LII': 'Industrials',
+    'TDY': 'Industrials', 'FTV': 'Industrials', 'EME': 'Industrials',
     'HII': 'Industrials', 'WAB': 'Industrials', 'ESAB': 'Industrials', 'CPRT': 'Industrials',
     'JBL': 'Industrials', 'CSGP': 'Industrials', 'MAS': 'Industrials', 'LW': 'Industrials',
     'APP': 'Industrials', 'EXE': 'Industrials',
@@ -167,7 +169,7 @@ TICKER_TO_SECTOR = {
     'SRE': 'Utilities', 'AEP': 'Utilities', 'VST': 'Utilities', 'D': 'Utilities',
     'PEG': 'Utilities', 'EXC': 'Utilities', 'XEL': 'Utilities', 'ED': 'Utilities',
     'ETR': 'Utilities', 'WEC': 'Utilities', 'AWK': 'Utilities', 'DTE': 'Utilities',
-    'DTE': 'Utilities', 'PPL': 'Utilities', 'ES': 'Utilities', 'FE': 'Utilities', 'AEE': 'Utilities',
+    'PPL': 'Utilities', 'ES': 'Utilities', 'FE': 'Utilities', 'AEE': 'Utilities',
     'EIX': 'Utilities', 'CMS': 'Utilities', 'CNP': 'Utilities', 'NRG': 'Utilities',
     'NI': 'Utilities', 'LNT': 'Utilities', 'EVRG': 'Utilities', 'AES': 'Utilities',
     'PNW': 'Utilities', 'PCG': 'Utilities', 'IDA': 'Utilities', 'ATO': 'Utilities',
@@ -211,18 +213,36 @@ SECTOR_TO_ETF = {
 # ETF to Sector mapping (reverse)
 ETF_TO_SECTOR = {v: k for k, v in SECTOR_TO_ETF.items()}
 
+# Sector to tickers (inverted index, built in one pass at import; mapping order)
+SECTOR_TO_TICKERS = {}
+for _ticker, _sector in TICKER_TO_SECTOR.items():
+    SECTOR_TO_TICKERS.setdefault(_sector, []).append(_ticker)
+SECTOR_TO_TICKERS = {sector: tuple(tickers) for sector, tickers in SECTOR_TO_TICKERS.items()}
+del _ticker, _sector
 
-def get_sector(ticker: str) -> str:
+# Per-sector (etf, ticker_count, sorted tickers), computed once for get_sector_stats
+_SECTOR_STATS = {
+    sector: (etf, len(SECTOR_TO_TICKERS.get(sector, ())), tuple(sorted(SECTOR_TO_TICKERS.get(sector, ()))))
+    for sector, etf in SECTOR_TO_ETF.items()
+}
+
+
+def get_sector(ticker: str, _lookup=TICKER_TO_SECTOR.get) -> str:
     """
     Get the GICS sector for a ticker.
     
+    The dict lookup is bound as a default argument, so each call goes straight
+    to the C-level dict.get without global/attribute lookups. For bulk lookups,
+    map over the dict directly (e.g. `series.map(TICKER_TO_SECTOR).fillna('Unknown')`
+    for a pandas Series of tickers).
+    
     Args:
         ticker: Stock ticker symbol
         
     Returns:
         GICS sector name or 'Unknown' if not found
     """
-    return TICKER_TO_SECTOR.get(ticker, 'Unknown')
+    return _lookup(ticker, 'Unknown')
 
 
 def get_etf_ticker(sector: str) -> str:
@@ -248,7 +268,7 @@ def get_tickers_by_sector(sector: str) -> list[str]:
     Returns:
         List of ticker symbols in the sector
     """
-    return [ticker for ticker, sec in TICKER_TO_SECTOR.items() if sec == sector]
+    return list(SECTOR_TO_TICKERS.get(sector, ()))
 
 
 def get_sector_stats() -> dict:
@@ -258,15 +278,11 @@ def get_sector_stats() -> dict:
     Returns:
         Dictionary with sector statistics
     """
-    stats = {}
-    for sector in SECTOR_TO_ETF.keys():
-        tickers = get_tickers_by_sector(sector)
-        stats[sector] = {
-            'etf': SECTOR_TO_ETF[sector],
-            'ticker_count': len(tickers),
-            'tickers': sorted(tickers)
-        }
-    return stats
+    # Fresh dicts/lists per call, so callers can't mutate the precomputed stats
+    return {
+        sector: {'etf': etf, 'ticker_count': count, 'tickers': list(tickers)}
+        for sector, (etf, count, tickers) in _SECTOR_STATS.items()
+    }
 
 
 if __name__ == "__main__":
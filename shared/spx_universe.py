@@ -13,9 +13,10 @@ from pathlib import Path
 from typing import Optional, List
 import pandas as pd
 import requests
-from io import StringIO
+from io import BytesIO, StringIO
 import json
 import sys
+from lxml import etree
 
 WIKI_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
 GITHUB_SPX_URL = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/main/data/constituents.csv"
@@ -126,6 +127,36 @@ def deduplicate_tickers(tickers: list) -> list:
     return sorted(deduplicated)
 
 
+def parse_wikipedia_symbols(content: bytes) -> list:
+    """
+    Extract ticker symbols from the Wikipedia constituents table.
+    
+    Streams the page with lxml iterparse and stops at the table with
+    id="constituents", clearing every earlier table, so the full document
+    tree is never materialized.
+    
+    Args:
+        content: Raw HTML bytes of the Wikipedia page
+        
+    Returns:
+        List of ticker symbols as they appear on Wikipedia (e.g., BRK.B)
+    """
+    for _, elem in etree.iterparse(BytesIO(content), html=True, tag='table'):
+        if elem.get('id') == 'constituents':
+            symbols = []
+            for tr in elem.iter('tr'):
+                first_cell = tr.find('td')
+                if first_cell is None:
+                    continue  # Header row
+                symbol = ''.join(first_cell.itertext()).strip()
+                if symbol:
+                    symbols.append(symbol)
+            return symbols
+        elem.clear()
+    
+    raise ValueError("Could not find S&P 500 constituents table")
+
+
 def convert_ticker_for_sec(ticker: str) -> str:
     """
     Convert Wikipedia ticker format to SEC EDGAR format.
@@ -168,24 +199,16 @@ def fetch_spx_tickers(sec_compatible: bool = False) -> list:
         response = requests.get(WIKI_URL, headers=headers, timeout=20)
         response.raise_for_status()
         
-        tables = pd.read_html(StringIO(response.text))
-        
-        # Find the table with 'Symbol' column and enough rows
-        df = None
-        for table in tables:
-            if 'Symbol' in table.columns and len(table) > 400:
-                df = table
-                break
-        
-        if df is None:
-            raise ValueError("Could not find S&P 500 constituents table")
+        symbols = parse_wikipedia_symbols(response.content)
+        if len(symbols) <= 400:
+            raise ValueError(f"Constituents table too small ({len(symbols)} rows)")
         
         # Convert tickers
         if sec_compatible:
-            tickers = [convert_ticker_for_sec(t) for t in df['Symbol'].tolist()]
+            tickers = [convert_ticker_for_sec(t) for t in symbols]
         else:
             # Replace . with - for Yahoo Finance compatibility (e.g., BRK.B -> BRK-B)
-            tickers = df['Symbol'].str.replace('.', '-', regex=False).tolist()
+            tickers = [t.replace('.', '-') for t in symbols]
         
         tickers = deduplicate_tickers(tickers)
         print(f"✓ Fetched {len(tickers)} tickers from Wikipedia", file=sys.stderr)